@@ -136,6 +136,9 @@ def load_project_config(repo_root: Path) -> Config:
     return Config(general=general, ignore=ConfigIgnore(patterns=patterns))
 
 
+_GLOB_CHARS = frozenset("*?[")
+
+
 def compile_ignore_matchers(cfg: Optional[Config] = None) -> tuple[Callable[[str, Optional[str]], bool], Callable[[str, Optional[str]], bool]]:
     """Return (file_matcher, dir_matcher).
 
@@ -152,24 +155,32 @@ def compile_ignore_matchers(cfg: Optional[Config] = None) -> tuple[Callable[[str
         else:
             file_patterns.append(pat)
 
-    def _match_any(name: str, rel_posix: Optional[str], patterns: list[str]) -> bool:
-        for p in patterns:
-            try:
-                if fnmatch.fnmatchcase(name, p):
-                    return True
-                if rel_posix and ("/" in p) and fnmatch.fnmatchcase(rel_posix, p):
-                    return True
-            except Exception:
-                continue
-        return False
-
-    def file_matcher(name: str, rel_posix: Optional[str]) -> bool:
-        return _match_any(name, rel_posix, file_patterns)
-
-    def dir_matcher(name: str, rel_posix: Optional[str]) -> bool:
-        # Directory names match by base name or relative posix
-        return _match_any(name, rel_posix, dir_patterns)
-
+    def _compile(patterns: list[str]) -> Callable[[str, Optional[str]], bool]:
+        # Literal patterns (the defaults, and most user entries) become frozenset lookups;
+        # only patterns with glob metacharacters go through fnmatch per entry.
+        literal = [p for p in patterns if not _GLOB_CHARS.intersection(p)]
+        names = frozenset(p for p in literal if "/" not in p)
+        paths = frozenset(p for p in literal if "/" in p)
+        globs = [p for p in patterns if _GLOB_CHARS.intersection(p)]
+
+        def matcher(name: str, rel_posix: Optional[str]) -> bool:
+            if name in names or (rel_posix and rel_posix in paths):
+                return True
+            for p in globs:
+                try:
+                    if fnmatch.fnmatchcase(name, p):
+                        return True
+                    if rel_posix and ("/" in p) and fnmatch.fnmatchcase(rel_posix, p):
+                        return True
+                except Exception:
+                    continue
+            return False
+
+        return matcher
+
+    file_matcher = _compile(file_patterns)
+    # Directory names match by base name or relative posix
+    dir_matcher = _compile(dir_patterns)
     return file_matcher, dir_matcher
 
 
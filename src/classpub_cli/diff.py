@@ -35,8 +35,7 @@ def _entry_from_manifest_token(token: str) -> Optional[Entry]:
     when the corresponding path may not currently exist under pending/.
     """
     tok = token.strip().replace("\\", "/")
-    if tok.startswith("pending/"):
-        tok = tok[len("pending/") :]
+    tok = tok.removeprefix("pending/")
     prefer_dir = tok.endswith("/")
     tok_no_slash = tok[:-1] if prefer_dir else tok
     entries = read_manifest()
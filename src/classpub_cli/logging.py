@@ -13,15 +13,38 @@ from platformdirs import PlatformDirs
 from rich.console import Console
 from rich.logging import RichHandler
 
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib fallback emits the same compact lines
+    orjson = None  # type: ignore[assignment]
+
 
 APP_NAME = "classpub"
 APP_AUTHOR = "olearydj"
 
 
+def _dumps_stdlib(payload: dict) -> str:
+    # Compact separators match orjson's output byte-for-byte in layout
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=datetime.isoformat)
+
+
+def _dumps_orjson(payload: dict) -> str:
+    # orjson renders datetimes as RFC 3339 (same as isoformat()) and never escapes non-ASCII
+    try:
+        return orjson.dumps(payload).decode("utf-8")
+    except TypeError:
+        # orjson rejects lone surrogates (os.fsdecode'd undecodable filenames); stdlib accepts them
+        return _dumps_stdlib(payload)
+
+
 class JsonLineFormatter(logging.Formatter):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._dumps = _dumps_orjson if orjson is not None else _dumps_stdlib
+
     def format(self, record: LogRecord) -> str:  # type: ignore[override]
         payload = {
-            "time": datetime.now(timezone.utc).isoformat(),
+            "time": datetime.now(timezone.utc),
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
@@ -30,7 +53,7 @@ class JsonLineFormatter(logging.Formatter):
             "module": record.module,
             "pathname": record.pathname,
         }
-        return json.dumps(payload, ensure_ascii=False)
+        return self._dumps(payload)
 
 
 def _ensure_log_dir() -> Path:
@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from dataclasses import dataclass
+import functools
 from datetime import datetime, timezone
 import socket
 import time
@@ -337,6 +338,22 @@ def strip_notebook_outputs_in_preview(
 LOCK_PATH = Path(".classpub.lock")
 MARKER_PATH = Path(".sync-in-progress")
 LOCK_TTL_SECS = 30
+_LOCK_TEMPLATE = b"pid: %d\nhost: %b\ntime: %b\n"
+
+
+def _parse_kv_lines(content: str) -> dict[str, str]:
+    """Parse the "key: value" lines written by _acquire_single_writer_lock/_write_marker."""
+    out: dict[str, str] = {}
+    for ln in content.splitlines():
+        k, sep, v = ln.partition(": ")
+        if sep:
+            out[k] = v
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _hostname_bytes() -> bytes:
+    return socket.gethostname().encode("utf-8")
 
 
 def _is_pid_alive(pid: int) -> bool:
@@ -351,13 +368,12 @@ def _is_pid_alive(pid: int) -> bool:
 
 def _acquire_single_writer_lock(ttl_seconds: int = LOCK_TTL_SECS) -> tuple[bool, str]:
     now_iso = datetime.now(timezone.utc).isoformat()
-    hostname = socket.gethostname()
     pid = os.getpid()
 
     if LOCK_PATH.exists():
         try:
             content = LOCK_PATH.read_text(encoding="utf-8")
-            lines = {k: v for k, v in (ln.split(": ", 1) for ln in content.splitlines() if ": " in ln)}
+            lines = _parse_kv_lines(content)
             parsed_ok = True
             try:
                 owner_pid = int(lines.get("pid", ""))
@@ -371,11 +387,12 @@ def _acquire_single_writer_lock(ttl_seconds: int = LOCK_TTL_SECS) -> tuple[bool,
                 then = None
                 parsed_ok = False
 
-            if not parsed_ok or then is None:
-                # Corrupt or incomplete lock → remove and proceed
+            if not parsed_ok or then is None or then.tzinfo is None:
+                # Corrupt, incomplete, or naive-time lock → remove and proceed
                 LOCK_PATH.unlink(missing_ok=True)
             else:
-                age = (datetime.now(timezone.utc) - then).total_seconds()
+                # Epoch float arithmetic; no aware "now" datetime or timedelta needed
+                age = time.time() - then.timestamp()
                 if (not _is_pid_alive(owner_pid)) and age > ttl_seconds:
                     # Stale
                     LOCK_PATH.unlink(missing_ok=True)
@@ -391,10 +408,11 @@ def _acquire_single_writer_lock(ttl_seconds: int = LOCK_TTL_SECS) -> tuple[bool,
     # Try to create exclusively
     try:
         fd = os.open(str(LOCK_PATH), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            f.write(f"pid: {pid}\n")
-            f.write(f"host: {hostname}\n")
-            f.write(f"time: {now_iso}\n")
+        try:
+            # One write of the whole record; no text-mode wrapper or per-line flushes
+            os.write(fd, _LOCK_TEMPLATE % (pid, _hostname_bytes(), now_iso.encode("ascii")))
+        finally:
+            os.close(fd)
     except FileExistsError:
         return False, "busy"
     except Exception:
@@ -419,7 +437,7 @@ def _check_marker_and_maybe_force_full_resync(assume_yes: bool) -> bool:
     # Determine staleness
     try:
         content = MARKER_PATH.read_text(encoding="utf-8")
-        lines = {k: v for k, v in (ln.split(": ", 1) for ln in content.splitlines() if ": " in ln)}
+        lines = _parse_kv_lines(content)
         ts = lines.get("time")
         if ts:
             then = datetime.fromisoformat(ts)
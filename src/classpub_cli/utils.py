@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+import functools
 import logging
 import re
-import shutil
-import subprocess
 from dataclasses import dataclass
 from enum import Enum
 import os
 import unicodedata
 from pathlib import Path
 import hashlib
-from typing import Iterable, Optional, Tuple, List, Sequence
+import mmap
+from importlib.util import find_spec
+from typing import Callable, Iterable, Iterator, Optional, Tuple, List, Sequence
 import nbformat
 import json
 
@@ -35,8 +36,10 @@ def check_python_deps() -> list[str]:
     ]
     missing: list[str] = []
     for name in required:
+        # Presence check only: consult the finders without executing the (heavy) modules
         try:
-            __import__(name)
+            if find_spec(name) is None:
+                missing.append(name)
         except Exception:  # pragma: no cover - exact import error type not essential
             missing.append(name)
     return missing
@@ -44,34 +47,82 @@ def check_python_deps() -> list[str]:
 
 _VER_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
 
+# Git executable, resolved on first use and then reused for the rest of the process
+_UNRESOLVED = object()
+_GIT_EXE: object = _UNRESOLVED
+
+
+def _git_exe() -> Optional[str]:
+    global _GIT_EXE
+    if _GIT_EXE is _UNRESOLVED:
+        import shutil
+
+        _GIT_EXE = shutil.which("git")
+    return _GIT_EXE  # type: ignore[return-value]
+
+
+# Parsed `git --version` (version tuple, display string); only successful parses are cached
+_GIT_VERSION: object = _UNRESOLVED
+
+
+def _reset_git_cache() -> None:
+    """Forget the resolved git executable and version so the next call probes again."""
+    global _GIT_EXE, _GIT_VERSION
+    _GIT_EXE = _UNRESOLVED
+    _GIT_VERSION = _UNRESOLVED
+
+
+def _git_version(exe: str) -> tuple[Optional[Tuple[int, int, int]], str]:
+    # Imported here: only the validate/diff paths need to spawn git
+    import subprocess
+
+    try:
+        proc = subprocess.run([exe, "--version"], capture_output=True, timeout=2, check=False)
+    except (OSError, subprocess.SubprocessError):
+        return None, ""
+    if proc.returncode != 0:
+        return None, ""
+    # The version is on the first line and is ASCII; skip decoding anything after it
+    out = (proc.stdout or b"").split(b"\n", 1)[0].decode("ascii", "replace")
+    # Fast path for the stable "git version X.Y.Z..." format; regex as fallback
+    try:
+        nums = out.split()[2].split(".")[:3]
+        ver_tuple = (int(nums[0]), int(nums[1]), int(nums[2]))
+    except (IndexError, ValueError):
+        m = _VER_RE.search(out)
+        if not m:
+            return None, out.strip()
+        ver_tuple = tuple(int(x) for x in m.groups())  # type: ignore[assignment]
+    return ver_tuple, ".".join(str(x) for x in ver_tuple)
+
 
 def git_version_ok(min_ver: Tuple[int, int, int] = (2, 20, 0)) -> tuple[bool, str]:
-    exe = shutil.which("git")
+    global _GIT_VERSION
+    exe = _git_exe()
     if not exe:
         return False, ""
-    try:
-        out = subprocess.check_output([exe, "--version"], text=True)
-    except Exception:
-        return False, ""
-    m = _VER_RE.search(out or "")
-    if not m:
-        return False, out.strip() if out else ""
-    ver_tuple = tuple(int(x) for x in m.groups())  # type: ignore[arg-type]
-    ok = ver_tuple >= min_ver
-    return ok, ".".join(str(x) for x in ver_tuple)
+    if _GIT_VERSION is not _UNRESOLVED:
+        ver_tuple, display = _GIT_VERSION  # type: ignore[misc]
+    else:
+        ver_tuple, display = _git_version(exe)
+        if ver_tuple is not None:
+            # One fork+exec per process once git answers; a timeout or failure is retried next call
+            _GIT_VERSION = (ver_tuple, display)
+    return (ver_tuple is not None and ver_tuple >= min_ver), display
+
+
+_LEVEL_MAP: dict[str, int] = {
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+    "debug": logging.DEBUG,
+}
 
 
 def compute_console_level(verbose_count: int, quiet_count: int, explicit_level: Optional[str]) -> int:
     if explicit_level:
-        mapping = {
-            "error": logging.ERROR,
-            "warning": logging.WARNING,
-            "info": logging.INFO,
-            "debug": logging.DEBUG,
-        }
-        return mapping.get(explicit_level.lower(), logging.INFO)
+        return _LEVEL_MAP.get(explicit_level.lower(), logging.INFO)
     # Detect environment: default WARNING in production, INFO otherwise
-    import os
     env = os.environ.get("CLASSPUB_ENV", "development").lower()
     default_level = logging.WARNING if env in {"prod", "production"} else logging.INFO
     # Start from default and move up/down
@@ -90,27 +141,35 @@ def compute_console_level(verbose_count: int, quiet_count: int, explicit_level:
 # Ignore filters per §8.4 (defaults live here; configurable via config module)
 DEFAULT_IGNORED_FILES: tuple[str, ...] = (".DS_Store", ".gitignore", ".gitattributes", "RELEASES.txt")
 DEFAULT_IGNORED_DIRS: tuple[str, ...] = (".ipynb_checkpoints",)
+# Set views of the defaults for O(1) membership checks in tree walks
+_IGNORED_FILES_SET: frozenset[str] = frozenset(DEFAULT_IGNORED_FILES)
+_IGNORED_DIRS_SET: frozenset[str] = frozenset(DEFAULT_IGNORED_DIRS)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Entry:
     raw: str
     rel: Path
     is_dir: bool
 
 
+# Manifest paths and basenames repeat across every lookup in a run; callers pass str, never Path
+@functools.lru_cache(maxsize=8192)
 def _normalize_nfc(text: str) -> str:
+    if text.isascii():
+        # ASCII is already NFC
+        return text
     return unicodedata.normalize("NFC", text)
 
 
 def _is_ignored_file(name: str) -> bool:
     # Backward-compatible default check; overridden by config-driven helpers in callers
-    return name in DEFAULT_IGNORED_FILES
+    return name in _IGNORED_FILES_SET
 
 
 def _is_ignored_dir(name: str) -> bool:
     # Backward-compatible default check; overridden by config-driven helpers in callers
-    return name.rstrip("/") in DEFAULT_IGNORED_DIRS
+    return name.rstrip("/") in _IGNORED_DIRS_SET
 
 
 def ensure_repo_root_present() -> bool:
@@ -118,25 +177,26 @@ def ensure_repo_root_present() -> bool:
     return PENDING.exists() and PENDING.is_dir()
 
 
+# One manifest line with surrounding whitespace trimmed; blank and comment lines never match
+_MANIFEST_LINE_RE = re.compile(r"^[^\S\n]*([^#\s][^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+
 def read_manifest() -> list[Entry]:
     if not MANIFEST.exists():
         return []
+    # Scan all non-empty, non-comment lines in one regex pass; deduplicate inline
+    # while preserving order (by exact raw match)
     entries: list[Entry] = []
-    for line in MANIFEST.read_text(encoding="utf-8").splitlines():
-        s = line.strip()
-        if not s or s.startswith("#"):
+    seen: set[str] = set()
+    for m in _MANIFEST_LINE_RE.finditer(MANIFEST.read_text(encoding="utf-8")):
+        s = m.group(1)
+        if s in seen:
             continue
+        seen.add(s)
         is_dir = s.endswith("/")
         rel = Path(s[:-1] if is_dir else s)
         entries.append(Entry(raw=s, rel=rel, is_dir=is_dir))
-    # Deduplicate while preserving order (by exact raw match)
-    seen: set[str] = set()
-    deduped: list[Entry] = []
-    for e in entries:
-        if e.raw not in seen:
-            seen.add(e.raw)
-            deduped.append(e)
-    return deduped
+    return entries
 
 
 # --------------------------
@@ -159,16 +219,68 @@ def sha256_file(path: Path, chunk_size: int = 8192) -> str:
     return h.hexdigest()
 
 
-def files_equal(a: Path, b: Path, chunk_size: int = 8192) -> bool:
+# Size of the head/tail blocks compared directly before the full mmap comparison
+_EDGE_BLOCK = 64 * 1024
+_MADV_SEQUENTIAL: Optional[int] = getattr(mmap, "MADV_SEQUENTIAL", None)
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def files_equal(a: Path, b: Path, chunk_size: int = 1 << 20, *, trust_mtime: bool = False) -> bool:
     """Return True if two files are byte-identical.
 
-    First compares file sizes; if they match, compares streamed SHA-256 digests.
+    Two names for the same inode are equal without reading. Otherwise compares file
+    sizes (and, with ``trust_mtime``, treats equal size plus equal mtime_ns as equal);
+    if they match, compares the first and last 64 KiB directly (most differing files
+    differ near the head or tail), then compares the whole of both files through
+    read-only mmaps, ``chunk_size`` bytes at a time.
     """
     sa = a.stat()
     sb = b.stat()
+    # st_ino is 0 for every file on some filesystems (FAT, some Windows stat paths)
+    if sa.st_ino != 0 and sa.st_ino == sb.st_ino and sa.st_dev == sb.st_dev:
+        return True
     if sa.st_size != sb.st_size:
         return False
-    return sha256_file(a, chunk_size=chunk_size) == sha256_file(b, chunk_size=chunk_size)
+    if trust_mtime and sa.st_mtime_ns == sb.st_mtime_ns:
+        return True
+    # Raw fds: positional reads need no seek or userspace buffer, and mmap takes the fd directly
+    fa = os.open(a, _O_RDONLY_BINARY)
+    try:
+        fb = os.open(b, _O_RDONLY_BINARY)
+        try:
+            return _fds_equal(fa, fb, sa.st_size, chunk_size)
+        finally:
+            os.close(fb)
+    finally:
+        os.close(fa)
+
+
+def _read_at(fd: int, n: int, offset: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, n, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, n)
+
+
+def _fds_equal(fa: int, fb: int, size: int, chunk_size: int) -> bool:
+    if _read_at(fa, _EDGE_BLOCK, 0) != _read_at(fb, _EDGE_BLOCK, 0):
+        return False
+    if size <= _EDGE_BLOCK:
+        # Head block covered the whole file
+        return True
+    if size > 2 * _EDGE_BLOCK:
+        tail = size - _EDGE_BLOCK
+        if _read_at(fa, _EDGE_BLOCK, tail) != _read_at(fb, _EDGE_BLOCK, tail):
+            return False
+    with mmap.mmap(fa, 0, access=mmap.ACCESS_READ) as ma, mmap.mmap(fb, 0, access=mmap.ACCESS_READ) as mb:
+        if _MADV_SEQUENTIAL is not None:
+            ma.madvise(_MADV_SEQUENTIAL)
+            mb.madvise(_MADV_SEQUENTIAL)
+        # Slicing an mmap yields bytes, whose == is a single memcmp (memoryview == compares per item)
+        for off in range(0, len(ma), chunk_size):
+            if ma[off : off + chunk_size] != mb[off : off + chunk_size]:
+                return False
+    return True
 
 
 # --------------------------
@@ -232,31 +344,56 @@ def content_equal(a: Path, b: Path) -> bool:
     return files_equal(a, b)
 
 
-def _list_rel_files(root: Path) -> list[Path]:
-    files: list[Path] = []
+def _scandir_rec(
+    root: Path, rel: str = "", prune: Optional[Callable[[str, str], bool]] = None
+) -> Iterator[tuple[str, os.DirEntry, bool]]:
+    """Yield (rel_posix, entry, is_dir) for every entry under root, depth-first.
+
+    Entry types come from the cached os.scandir listing, so no extra stat() is
+    issued per entry; symlinks are reported (is_dir False) but never followed.
+    Unreadable directories are skipped, as os.walk does. Directories for which
+    prune(name, rel_posix) is true are yielded but not descended into.
+    """
+    try:
+        it = os.scandir(root / rel if rel else root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            yield child, entry, is_dir
+            if is_dir and not (prune and prune(entry.name, child)):
+                yield from _scandir_rec(root, child, prune)
+
+
+def _list_rel_files(root: Path) -> list[str]:
+    """Return sorted posix paths of non-ignored regular files under root (symlinks skipped)."""
     if not root.exists():
-        return files
+        return []
     cfg = get_active_config()
     file_ignored, dir_ignored = compile_ignore_matchers(cfg)
-    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
-        # filter ignored dirs in-place
-        rel_dir = Path(dirpath).relative_to(root).as_posix()
-        dirnames[:] = [d for d in dirnames if not dir_ignored(d, f"{rel_dir}/{d}" if rel_dir else d)]
-        for fname in filenames:
-            rel_posix = (Path(dirpath).relative_to(root) / fname).as_posix()
-            if file_ignored(fname, rel_posix):
-                continue
-            abs_path = Path(dirpath) / fname
-            try:
-                if abs_path.is_symlink():
-                    continue
-            except OSError:
-                logger.warning("Skipping path due to access issue: %s", abs_path)
+    rels: list[str] = []
+    for rel, entry, is_dir in _scandir_rec(root, prune=dir_ignored):
+        if is_dir:
+            continue
+        try:
+            if entry.is_symlink():
                 continue
-            rel = abs_path.relative_to(root)
-            files.append(rel)
-    files.sort(key=lambda p: p.as_posix())
-    return files
+        except OSError:
+            logger.warning("Skipping path due to access issue: %s", entry.path)
+            continue
+        if not file_ignored(entry.name, rel):
+            rels.append(rel)
+    rels.sort()
+    return rels
+
+
+# Below this many common files, thread start-up costs more than it overlaps
+_DIFF_POOL_MIN = 8
 
 
 def dir_diff(src: Path, dst: Path) -> tuple[list[Path], list[Path], list[Path]]:
@@ -271,21 +408,54 @@ def dir_diff(src: Path, dst: Path) -> tuple[list[Path], list[Path], list[Path]]:
     """
     src_files = _list_rel_files(src)
     dst_files = _list_rel_files(dst)
-    set_s = {p.as_posix() for p in src_files}
-    set_d = {p.as_posix() for p in dst_files}
-    added = sorted([Path(p) for p in (set_s - set_d)], key=lambda p: p.as_posix())
-    removed = sorted([Path(p) for p in (set_d - set_s)], key=lambda p: p.as_posix())
-    changed: list[Path] = []
-    for common in sorted(set_s & set_d):
-        a = src / common
-        b = dst / common
+    # Both listings are sorted posix strings, so one linear merge splits them into
+    # added/removed/common without building sets, re-sorting, or allocating Paths.
+    added: list[str] = []
+    removed: list[str] = []
+    common: list[str] = []
+    i = j = 0
+    while i < len(src_files) and j < len(dst_files):
+        a_posix = src_files[i]
+        b_posix = dst_files[j]
+        if a_posix == b_posix:
+            common.append(src_files[i])
+            i += 1
+            j += 1
+        elif a_posix < b_posix:
+            added.append(src_files[i])
+            i += 1
+        else:
+            removed.append(dst_files[j])
+            j += 1
+    added.extend(src_files[i:])
+    removed.extend(dst_files[j:])
+
+    # Opt-in: sync copies preserve mtimes, so size+mtime equality is a safe "unchanged" hint
+    trust_mtime = os.environ.get("CLASSPUB_FAST_DIFF") == "1"
+
+    src_s = os.fspath(src)
+    dst_s = os.fspath(dst)
+
+    def _differs(rel: str) -> bool:
         try:
-            if not files_equal(a, b):
-                changed.append(Path(common))
+            return not files_equal(
+                Path(os.path.join(src_s, rel)), Path(os.path.join(dst_s, rel)), trust_mtime=trust_mtime
+            )
         except OSError:
-            logger.warning("Comparison failed for %s", common)
-            changed.append(Path(common))
-    return added, removed, changed
+            logger.warning("Comparison failed for %s", rel)
+            return True
+
+    if len(common) < _DIFF_POOL_MIN:
+        flags = [_differs(rel) for rel in common]
+    else:
+        # Comparisons are I/O-bound (reads and memcmp release the GIL), so threads overlap them;
+        # map() keeps results in input order so `changed` stays sorted.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(common))) as pool:
+            flags = list(pool.map(_differs, common))
+    changed = [Path(rel) for rel, differs in zip(common, flags) if differs]
+    return [Path(r) for r in added], [Path(r) for r in removed], changed
 
 
 def _atomic_write(path: Path, content: str) -> None:
@@ -359,8 +529,7 @@ class Resolved:
 def normalize_input_token(token: str) -> str:
     s = token.strip()
     s = s.replace("\\", "/")
-    if s.startswith("./"):
-        s = s[2:]
+    s = s.removeprefix("./")
     return _normalize_nfc(s)
 
 
@@ -383,25 +552,27 @@ def scan_pending_tree() -> tuple[list[Path], list[Path]]:
     dirs: set[Path] = set()
     if not ensure_repo_root_present():
         return files, list(dirs)
-    for root, dirnames, filenames in os.walk(PENDING, followlinks=False):
+    # Walk the resolved root: fwalk(follow_symlinks=False) yields nothing for a root that is
+    # itself a symlink. fwalk resolves entries against open directory fds (POSIX only);
+    # symlinked subdirectories are listed but not descended into either way.
+    base = PENDING.resolve()
+    if hasattr(os, "fwalk"):
+        walk: Iterable[tuple[str, list[str], list[str]]] = (
+            (d, dn, fn) for d, dn, fn, _dirfd in os.fwalk(base, follow_symlinks=False)
+        )
+    else:
+        walk = os.walk(base, followlinks=False)
+    for root, dirnames, filenames in walk:
         # Filter ignored directories in-place to avoid walking them
         dirnames[:] = [d for d in dirnames if not _is_ignored_dir(d)]
-        # Record directories relative to PENDING
+        # Record directories relative to PENDING (the first yield covers top-level
+        # directories, so empty ones are included without a separate listing)
         for d in dirnames:
-            rel_dir = Path(os.path.relpath(Path(root) / d, PENDING))
-            dirs.add(rel_dir)
+            dirs.add(Path(os.path.relpath(os.path.join(root, d), base)))
         for fname in filenames:
             if _is_ignored_file(fname):
                 continue
-            rel_file = Path(os.path.relpath(Path(root) / fname, PENDING))
-            files.append(rel_file)
-    # Always include top-level directories under PENDING (even if empty)
-    try:
-        for p in PENDING.iterdir():
-            if p.is_dir() and not _is_ignored_dir(p.name):
-                dirs.add(Path(p.name))
-    except FileNotFoundError:
-        pass
+            files.append(Path(os.path.relpath(os.path.join(root, fname), base)))
     # Sort deterministically
     files = sorted(files, key=lambda p: p.as_posix())
     dirs_list = sorted(list(dirs), key=lambda p: p.as_posix())
@@ -441,8 +612,7 @@ def resolve_item(token: str) -> Resolved:
         return Resolved(status=Resolution.NOT_FOUND)
 
     # Strip pending/ prefix if present
-    if tok.startswith("pending/"):
-        tok = tok[len("pending/") :]
+    tok = tok.removeprefix("pending/")
 
     # Trailing slash indicates preference for directory
     prefer_dir = tok.endswith("/")
@@ -496,33 +666,30 @@ def resolve_item(token: str) -> Resolved:
     return Resolved(status=Resolution.AMBIGUOUS, candidates=sorted(cand, key=lambda t: t[0].as_posix()))
 
 
+def _listing_section(header: str, paths: list[Path], limit: int, suffix: str = "") -> Iterator[str]:
+    yield header
+    for p in paths[:limit]:
+        yield f"  {p.as_posix()}{suffix}"
+    if len(paths) > limit:
+        yield f"  (+{len(paths) - limit} more)"
+
+
 def format_grouped_listing_for_not_found(limit: int = 200) -> list[str]:
     files, dirs = scan_pending_tree()
     out: list[str] = []
     if files:
-        out.append("Files:")
-        display = files[:limit]
-        for p in display:
-            out.append(f"  {p.as_posix()}")
-        if len(files) > limit:
-            out.append(f"  (+{len(files) - limit} more)")
+        out.extend(_listing_section("Files:", files, limit))
     if dirs:
-        out.append("Folders:")
-        display_d = dirs[:limit]
-        for p in display_d:
-            out.append(f"  {p.as_posix()}/")
-        if len(dirs) > limit:
-            out.append(f"  (+{len(dirs) - limit} more)")
+        out.extend(_listing_section("Folders:", dirs, limit, suffix="/"))
     return out
 
 
 def format_ambiguity_list(candidates: Sequence[tuple[Path, str]], limit: int = 50) -> list[str]:
-    out: list[str] = []
-    display = list(candidates)[:limit]
-    for rel, label in display:
-        suffix = "(file)" if label == "file" else "(folder)"
-        name = rel.as_posix() + ("/" if label == "folder" else "")
-        out.append(f"  {name} {suffix}")
+    shown = candidates if len(candidates) <= limit else candidates[:limit]
+    out = [
+        f"  {rel.as_posix()} (file)" if label == "file" else f"  {rel.as_posix()}/ (folder)"
+        for rel, label in shown
+    ]
     if len(candidates) > limit:
         out.append(f"  (+{len(candidates) - limit} more)")
     return out
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import logging
 import os
+from bisect import bisect_left
 from dataclasses import dataclass
+import heapq
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Optional, Sequence
 
 from .paths import PENDING, PREVIEW, MANIFEST
 from .utils import (
     read_manifest,
     ensure_repo_root_present,
+    _scandir_rec,
 )
 from .config import get_active_config, compile_ignore_matchers
 from . import utils as utils_mod
@@ -41,38 +44,38 @@ def _error(console_print: Callable[[str], None], msg: str, counts: ValidateCount
     console_print(f"❌ {msg}")
 
 
-def _case_collision_messages(root: Path, label: str, limit_groups: int = 50) -> list[str]:
+def _case_collision_messages(
+    root: Path, label: str, dir_ignored: Callable[[str, Optional[str]], bool], limit_groups: int = 50
+) -> list[str]:
     """Return warning messages for potential case-collisions under root.
 
-    Builds a map of casefolded relative paths to their distinct original spellings.
+    Maps each casefolded relative path to its first original spelling and only
+    allocates a group once a second distinct spelling shows up.
     Emits one message per group with >1 distinct forms.
     """
-    groups: dict[str, set[str]] = {}
+    seen: dict[str, str] = {}
+    dups: dict[str, list[str]] = {}
     if not root.exists():
         return []
-    cfg = get_active_config()
-    _file_ignored, dir_ignored = compile_ignore_matchers(cfg)
-    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
-        # Consider both directories and files
-        rel_dir = Path(dirpath).relative_to(root)
-        # Record directories
-        for d in list(dirnames):
-            if dir_ignored(d, (rel_dir / d).as_posix()):
-                continue
-            rel = (rel_dir / d).as_posix()
-            groups.setdefault(rel.casefold(), set()).add(rel)
-        # Record files
-        for f in filenames:
-            rel = (rel_dir / f).as_posix()
-            groups.setdefault(rel.casefold(), set()).add(rel)
+    # Consider both directories and files; ignored subtrees are never entered
+    for rel, _entry, is_dir in _scandir_rec(root, prune=dir_ignored):
+        if is_dir and dir_ignored(rel.rpartition("/")[2], rel):
+            continue
+        # For ASCII, lower() is equivalent to casefold() and cheaper
+        key = rel.lower() if rel.isascii() else rel.casefold()
+        prev = seen.get(key)
+        if prev is None:
+            seen[key] = rel
+        elif prev != rel:
+            dups.setdefault(key, [prev]).append(rel)
 
     messages: list[str] = []
-    for i, originals in enumerate(v for v in groups.values() if len(v) > 1):
+    for i, originals in enumerate(dups.values()):
         if i >= limit_groups:
             messages.append("  (+more)")
             break
         try:
-            a, b = sorted(list(originals))[:2]
+            a, b = heapq.nsmallest(2, originals)
         except Exception:
             continue
         messages.append(f"⚠️  Potential case-collision in {label}: {a} vs {b}")
@@ -84,11 +87,10 @@ def _list_pending_checkpoints(limit: int = 200) -> list[str]:
     if not PENDING.exists():
         return lines
     found: list[str] = []
-    for dirpath, dirnames, _ in os.walk(PENDING, followlinks=False):
-        for d in list(dirnames):
-            if d == ".ipynb_checkpoints":
-                rel = Path(dirpath).relative_to(PENDING) / d
-                found.append(rel.as_posix())
+    # Record checkpoint dirs without descending into them
+    for rel, _entry, is_dir in _scandir_rec(PENDING, prune=lambda name, _rel: name == ".ipynb_checkpoints"):
+        if is_dir and rel.rpartition("/")[2] == ".ipynb_checkpoints":
+            found.append(rel)
     for rel in sorted(found)[:limit]:
         lines.append(f"⚠️  Found .ipynb_checkpoints under pending/: {rel}")
     if len(found) > limit:
@@ -96,12 +98,20 @@ def _list_pending_checkpoints(limit: int = 200) -> list[str]:
     return lines
 
 
-def _orphan_preview_folders_messages(tracked_files: set[str], tracked_dirs: set[str], limit: int = 200) -> list[str]:
+def _orphan_preview_folders_messages(
+    tracked_sorted: Sequence[str],
+    dir_ignored: Callable[[str, Optional[str]], bool],
+    limit: int = 200,
+) -> list[str]:
+    """Return warnings for top-level preview folders that hold nothing tracked.
+
+    tracked_sorted holds all tracked files and folders (folders with a trailing
+    slash) in sorted order, so one bisect per folder finds a tracked folder itself
+    or anything tracked beneath it.
+    """
     lines: list[str] = []
     if not PREVIEW.exists():
         return lines
-    cfg = get_active_config()
-    _file_ignored, dir_ignored = compile_ignore_matchers(cfg)
     try:
         entries = [p for p in PREVIEW.iterdir() if p.is_dir() and (not dir_ignored(p.name, p.relative_to(PREVIEW).as_posix()))]
     except FileNotFoundError:
@@ -109,22 +119,16 @@ def _orphan_preview_folders_messages(tracked_files: set[str], tracked_dirs: set[
     except PermissionError:
         return lines
 
-    def _covered_by_tracked_dir(rel_dir: str) -> bool:
-        for td in tracked_dirs:
-            if rel_dir == td or rel_dir.startswith(td.rstrip("/") + "/"):
-                return True
-        return False
-
-    def _contains_tracked_file(rel_dir: str) -> bool:
+    def _tracked_at_or_under(rel_dir: str) -> bool:
+        # Paths under prefix sort contiguously, so the first one >= prefix decides
         prefix = rel_dir.rstrip("/") + "/"
-        return any(tf.startswith(prefix) for tf in tracked_files)
+        i = bisect_left(tracked_sorted, prefix)
+        return i < len(tracked_sorted) and tracked_sorted[i].startswith(prefix)
 
     found: list[str] = []
     for p in entries:
         rel = p.relative_to(PREVIEW).as_posix()
-        if _covered_by_tracked_dir(rel):
-            continue
-        if _contains_tracked_file(rel):
+        if _tracked_at_or_under(rel):
             continue
         found.append(rel + "/")
 
@@ -135,12 +139,34 @@ def _orphan_preview_folders_messages(tracked_files: set[str], tracked_dirs: set[
     return lines
 
 
+def _read_git_global_config() -> Optional[dict[str, str]]:
+    """Return global git config as {key: value} from a single `git config --list` call.
+
+    Returns None if git cannot be run or the global config cannot be read.
+    """
+    exe = utils_mod._git_exe()
+    if not exe:
+        return None
+    try:
+        proc = subprocess.run(
+            [exe, "config", "--global", "--list"], capture_output=True, text=True, timeout=2, check=False
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if proc.returncode != 0:
+        return None
+    return dict(line.split("=", 1) for line in proc.stdout.splitlines() if "=" in line)
+
+
 def run_validate(console_print: Callable[[str], None]) -> int:
     """Execute validation checks and print results to stdout via console_print.
 
     Returns an exit code (0 on success with warnings allowed; 1 on critical errors).
     """
     counts = ValidateCounts()
+    # Resolve config and ignore matchers once for all tree checks below
+    cfg = get_active_config()
+    _file_ignored, dir_ignored = compile_ignore_matchers(cfg)
 
     # Dependency checks (Phase 0 behavior retained)
     missing = utils_mod.check_python_deps()
@@ -157,22 +183,19 @@ def run_validate(console_print: Callable[[str], None]) -> int:
         console_print("✅ Git OK")
 
     # Doctor-style environment advisories (non-fatal warnings)
+    git_cfg = _read_git_global_config()
     # Git identity
-    try:
-        name = subprocess.check_output(["git", "config", "--global", "user.name"], text=True).strip()
-        email = subprocess.check_output(["git", "config", "--global", "user.email"], text=True).strip()
-        if not name or not email:
-            _warn(console_print, "Git user.name/email not configured globally", counts)
-    except Exception:
+    if git_cfg is None:
         _warn(console_print, "Unable to read git user.name/email (is git installed/configured?)", counts)
+    elif not git_cfg.get("user.name", "").strip() or not git_cfg.get("user.email", "").strip():
+        _warn(console_print, "Git user.name/email not configured globally", counts)
 
     # nbdime git integration (best-effort)
-    try:
-        tool = subprocess.check_output(["git", "config", "--global", "diff.jupyternotebook.tool"], text=True).strip()
-        if tool.lower() != "nbdime":
-            _warn(console_print, "Nbdime git integration not detected (diff.jupyternotebook.tool != nbdime)", counts)
-    except Exception:
+    tool = git_cfg.get("diff.jupyternotebook.tool") if git_cfg is not None else None
+    if tool is None:
         _warn(console_print, "Nbdime git integration not detected (configure with: nbdime config-git --enable --global)", counts)
+    elif tool.strip().lower() != "nbdime":
+        _warn(console_print, "Nbdime git integration not detected (diff.jupyternotebook.tool != nbdime)", counts)
 
     # Structural checks below. If repo root is not present, still report errors but continue.
     if not PENDING.exists():
@@ -180,55 +203,63 @@ def run_validate(console_print: Callable[[str], None]) -> int:
     if not MANIFEST.exists():
         _error(console_print, "pending/RELEASES.txt is missing", counts)
 
+    preview_exists = PREVIEW.exists()
     try:
-        if PREVIEW.exists() and PREVIEW.is_symlink():
+        if preview_exists and PREVIEW.is_symlink():
             _error(console_print, "preview/ must not be a symlink", counts)
     except OSError:
         _error(console_print, "Unable to access preview/ to validate symlink status", counts)
 
-    if not PREVIEW.exists():
+    if not preview_exists:
         _warn(console_print, "preview/ is missing (informational)", counts)
 
-    # Manifest-based checks
+    # Manifest-based checks, in one pass over the entries: collect tracked paths,
+    # flag mixed separators on non-Windows hosts, and check folder presence.
+    # Warnings are collected per check and emitted in check order (all separator
+    # warnings, then folder presence), not interleaved per entry.
     entries = read_manifest()
-    tracked_dirs: set[str] = {e.rel.as_posix().rstrip("/") + "/" for e in entries if e.is_dir}
-    tracked_files: set[str] = {e.rel.as_posix() for e in entries if not e.is_dir}
-
-    # Mixed separators on non-Windows hosts
-    if os.name != "nt":
-        for e in entries:
-            if "\\" in e.raw:
-                _warn(console_print, f"Manifest uses Windows separators (\\) in: {e.raw}", counts)
-
-    # Manifest folder presence checks
+    tracked_dirs: set[str] = set()
+    tracked_files: set[str] = set()
+    check_separators = os.name != "nt"
+    separator_warnings: list[str] = []
+    presence_warnings: list[str] = []
     for e in entries:
+        rel_posix = e.rel.as_posix()
+        if check_separators and "\\" in e.raw:
+            separator_warnings.append(f"Manifest uses Windows separators (\\) in: {e.raw}")
         if not e.is_dir:
+            tracked_files.add(rel_posix)
             continue
-        src_dir = PENDING / e.rel
-        dst_dir = PREVIEW / e.rel
-        if not src_dir.exists():
-            _warn(console_print, f"{e.rel.as_posix()}/ (missing from pending)", counts)
-        if PREVIEW.exists() and not dst_dir.exists():
-            _warn(console_print, f"preview/{e.rel.as_posix()}/ is missing", counts)
+        tracked_dirs.add(rel_posix.rstrip("/") + "/")
+        if not (PENDING / e.rel).exists():
+            presence_warnings.append(f"{rel_posix}/ (missing from pending)")
+        if preview_exists and not (PREVIEW / e.rel).exists():
+            presence_warnings.append(f"preview/{rel_posix}/ is missing")
+    for msg in separator_warnings + presence_warnings:
+        _warn(console_print, msg, counts)
 
     # Orphan preview folders (top-level) not covered by tracked folders or files
-    _print_many(_orphan_preview_folders_messages(tracked_files, tracked_dirs), console_print)
-    if _orphan_preview_folders_messages(tracked_files, tracked_dirs):
-        # Count the number of warnings just printed (each line begins with ⚠️  )
-        counts.warnings += len(_orphan_preview_folders_messages(tracked_files, tracked_dirs))
+    tracked_sorted = sorted(tracked_files | tracked_dirs)
+    orphan_msgs = _orphan_preview_folders_messages(tracked_sorted, dir_ignored)
+    _print_many(orphan_msgs, console_print)
+    # Count the warnings just printed (each begins with ⚠️; the "(+N more)" line does not)
+    counts.warnings += sum(m.startswith("⚠️") for m in orphan_msgs)
 
     # Case-collision warnings
-    for root, label in ((PENDING, "pending/"), (PREVIEW, "preview/")):
-        msgs = _case_collision_messages(root, label)
+    roots = [(PENDING, "pending/")]
+    if preview_exists:
+        roots.append((PREVIEW, "preview/"))
+    for root, label in roots:
+        msgs = _case_collision_messages(root, label, dir_ignored)
         if msgs:
             _print_many(msgs, console_print)
-            counts.warnings += len([m for m in msgs if m.startswith("⚠️")])
+            counts.warnings += sum(m.startswith("⚠️") for m in msgs)
 
     # .ipynb_checkpoints under pending
     cp_msgs = _list_pending_checkpoints()
     if cp_msgs:
         _print_many(cp_msgs, console_print)
-        counts.warnings += len([m for m in cp_msgs if m.startswith("⚠️")])
+        counts.warnings += sum(m.startswith("⚠️") for m in cp_msgs)
 
     # Optional workflow advisory
     gh = Path(".github") / "workflows" / "publish-public.yml"
@@ -254,7 +285,7 @@ def run_validate(console_print: Callable[[str], None]) -> int:
 
     # Strict mode: escalate warnings to errors per config
     try:
-        strict = bool(get_active_config().general.strict)
+        strict = bool(cfg.general.strict)
     except Exception:
         strict = False
 
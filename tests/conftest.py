@@ -1,16 +1,42 @@
 from __future__ import annotations
 
 from pathlib import Path
+import io
 import os
-import unicodedata
+import shutil
+from types import SimpleNamespace
+from typing import Optional
 
 import pytest
 from typer.testing import CliRunner
 
+from classpub_cli import config, utils
+from classpub_cli.cli import app
+from classpub_cli.config import ensure_config_loaded
+from classpub_cli.diff import run_diff_all, run_diff_item
+from classpub_cli.sync import run_sync
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def cli_runner() -> CliRunner:
-    return CliRunner()
+    # CliRunner is stateless between invokes, so one instance serves the whole session
+    return CliRunner(mix_stderr=False)
+
+
+@pytest.fixture(autouse=True)
+def _reset_active_config(monkeypatch):
+    # The active config is process-global; start every test from defaults so
+    # results never depend on which test ran before on the same worker
+    monkeypatch.setattr(config, "_ACTIVE_CONFIG", None)
+
+
+@pytest.fixture(autouse=True)
+def _reset_git_cache():
+    # git executable/version are cached per process; tests that fake shutil.which or
+    # subprocess.run must not see (or leave behind) another test's probe
+    utils._reset_git_cache()
+    yield
+    utils._reset_git_cache()
 
 
 # Silence Jupyter deprecation warning about platformdirs by setting the env var at import time
@@ -25,6 +51,32 @@ def tmp_repo(tmp_path: Path, monkeypatch):
     yield repo
 
 
+@pytest.fixture
+def repo_cwd(tmp_path: Path, monkeypatch) -> Path:
+    """Run the test from an empty, per-test directory (no pending/ created)."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def make_tree(repo_cwd: Path):
+    """Create a repo-relative tree in one pass: one makedirs per directory, then raw byte writes.
+
+    Keys ending in ``/`` are created as (empty) directories; their values are ignored.
+    """
+
+    def _make(spec: dict[str, str | bytes]) -> None:
+        dirs = {rel.rstrip("/") if rel.endswith("/") else os.path.dirname(rel) for rel in spec}
+        for d in sorted(dirs):
+            if d:
+                os.makedirs(d, exist_ok=True)
+        for rel, content in spec.items():
+            if not rel.endswith("/"):
+                Path(rel).write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
+
+    return _make
+
+
 @pytest.fixture
 def write_manifest(tmp_repo: Path):
     def _write(lines: list[str], mode: str = "w") -> Path:
@@ -46,13 +98,8 @@ def read_manifest_lines(tmp_repo: Path):
         m = Path("pending") / "RELEASES.txt"
         if not m.exists():
             return []
-        out: list[str] = []
-        for line in m.read_text(encoding="utf-8").splitlines():
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            out.append(s)
-        return out
+        with m.open(encoding="utf-8") as f:
+            return [s for s in (line.strip() for line in f) if s and not s.startswith("#")]
     return _read
 
 
@@ -95,12 +142,104 @@ def make_files(tmp_repo: Path):
     return _make
 
 
-# Lightweight helpers for tests that need normalization utilities
-def posix(path: str) -> str:
-    return path.replace("\\", "/")
+# Pending content synced once into the shared diff baseline (see diff_baseline)
+DIFF_BASELINE_FILES: dict[str, str] = {
+    "notes.txt": "a\n",
+    "notebooks/demo.ipynb": "{\n  \"cells\": [], \n  \"metadata\": {}, \n  \"nbformat\": 4, \n  \"nbformat_minor\": 5\n}\n",
+    "notebooks/a.py": "a\n",
+    "a.txt": "x\n",
+    "file.txt": "1\n",
+    "data/a.txt": "a\n",
+    "data/b.txt": "b\n",
+    "filt/.DS_Store": "x\n",
+    "filt/.gitignore": "node_modules\n",
+    "filt/keep.txt": "k\n",
+    "j.txt": "1\n",
+    "f1.txt": "1\n",
+    "f2.txt": "2\n",
+    "pf.txt": "a\n",
+    "pfold/a.txt": "a\n",
+    "nbs/h.py": "x\n",
+    "café.txt": "1\n",
+    "k.txt": "1\n",
+}
+DIFF_BASELINE_MANIFEST: list[str] = [
+    "notes.txt",
+    "notebooks/demo.ipynb",
+    "notebooks/a.py",
+    "a.txt",
+    "file.txt",
+    "data/",
+    "z/",
+    "filt/",
+    "j.txt",
+    "f1.txt",
+    "f2.txt",
+    "pf.txt",
+    "pfold/",
+    "nbs/h.py",
+    "café.txt",
+    "k.txt",
+]
+
+
+@pytest.fixture(scope="module")
+def diff_baseline(tmp_path_factory) -> Path:
+    """Build a synced pending/ + preview/ repo once per module with a single real sync."""
+    root = tmp_path_factory.mktemp("diff-baseline")
+    pending = root / "pending"
+    (pending / "z").mkdir(parents=True)
+    for rel, content in DIFF_BASELINE_FILES.items():
+        p = pending / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content, encoding="utf-8")
+    (pending / "RELEASES.txt").write_text("".join(f"{line}\n" for line in DIFF_BASELINE_MANIFEST), encoding="utf-8")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(root)
+        res = CliRunner().invoke(app, ["sync", "--yes"])
+    assert res.exit_code == 0, res.stdout
+    return root
+
+
+@pytest.fixture
+def diff_repo(diff_baseline: Path, tmp_path: Path, monkeypatch):
+    """Private working copy of diff_baseline; tests may mutate it freely."""
+    repo = tmp_path / "repo"
+    # Real copies, not hardlinks: tests rewrite files in place, which would leak into the template
+    shutil.copytree(diff_baseline, repo, symlinks=True)
+    monkeypatch.chdir(repo)
+    yield repo
+
+
+@pytest.fixture
+def direct_diff():
+    """Call the diff engine in-process, skipping Typer parsing and logging setup.
+
+    Returns a Result-like object with ``exit_code`` and ``stdout`` for tests that only assert diff output.
+    """
+
+    def _invoke(item: Optional[str] = None) -> SimpleNamespace:
+        # Load this repo's config as the CLI callback would, so no earlier test's config leaks in
+        ensure_config_loaded(Path.cwd())
+        lines: list[str] = []
+        code = run_diff_all(lines.append) if item is None else run_diff_item(item, lines.append)
+        return SimpleNamespace(exit_code=code, stdout="".join(f"{ln}\n" for ln in lines))
 
+    return _invoke
+
+
+@pytest.fixture
+def direct_sync(capsys, monkeypatch):
+    """Call the sync engine in-process, feeding ``input`` to its prompts via stdin.
 
-def nfc(text: str) -> str:
-    return unicodedata.normalize("NFC", text)
+    Returns a Result-like object with ``exit_code`` and ``stdout`` (including prompt text).
+    """
 
+    def _invoke(*, yes: bool = False, dry_run: bool = False, input: Optional[str] = None) -> SimpleNamespace:
+        ensure_config_loaded(Path.cwd())
+        capsys.readouterr()
+        monkeypatch.setattr("sys.stdin", io.StringIO(input or ""))
+        code = run_sync(assume_yes=yes, dry_run=dry_run, console_print=print)
+        return SimpleNamespace(exit_code=code, stdout=capsys.readouterr().out)
 
+    return _invoke
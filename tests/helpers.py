@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-import unicodedata
+from unicodedata import normalize as _normalize
 
 
 def pending_path(*parts: str) -> Path:
@@ -13,6 +14,27 @@ def posix(path: str) -> str:
 
 
 def nfc(text: str) -> str:
-    return unicodedata.normalize("NFC", text)
-
-
+    return _normalize("NFC", text)
+
+
+def spray_files(directory: Path, n: int, content: bytes, prefix: str) -> None:
+    """Create ``{prefix}000.txt`` .. ``{prefix}{n-1:03d}.txt`` in ``directory`` with identical content.
+
+    Writes one prototype and hardlinks the rest to it, falling back to raw writes where links are unsupported.
+    """
+    proto = os.path.join(directory, f"{prefix}000.txt")
+    fd = os.open(proto, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+    for i in range(1, n):
+        target = os.path.join(directory, f"{prefix}{i:03d}.txt")
+        try:
+            os.link(proto, target)
+        except OSError:
+            fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, content)
+            finally:
+                os.close(fd)
@@ -4,6 +4,7 @@ from pathlib import Path
 from typer.testing import CliRunner
 
 from classpub_cli.cli import app
+from classpub_cli.config import Config, ConfigGeneral, ConfigIgnore, compile_ignore_matchers
 
 
 def test_config_init_creates_file(cli_runner: CliRunner, tmp_repo):
@@ -195,3 +196,13 @@ patterns = [
     assert "b.txt" in out
     assert "keep.txt" in out
 
+
+def test_ignore_matchers_literal_and_glob_patterns():
+    cfg = Config(general=ConfigGeneral(), ignore=ConfigIgnore(patterns=[".DS_Store", "*.tmp", "a/b.txt", "build/", "cache*/"]))
+    file_ignored, dir_ignored = compile_ignore_matchers(cfg)
+    assert file_ignored(".DS_Store", "x/.DS_Store")
+    assert file_ignored("z.tmp", "x/z.tmp")
+    assert file_ignored("b.txt", "a/b.txt") and not file_ignored("b.txt", "c/b.txt")
+    assert not file_ignored("keep.txt", "keep.txt")
+    assert dir_ignored("build", "x/build") and dir_ignored("cache_v2", "cache_v2")
+    assert not dir_ignored("src", "src")
@@ -5,7 +5,7 @@ from typer.testing import CliRunner
 from classpub_cli.cli import app
 
 
-def test_global_verbose_and_quiet_affect_log_level():
+def test_global_verbose_and_quiet_affect_log_level(tmp_repo):
     runner = CliRunner()
     res1 = runner.invoke(app, ["--verbose", "--verbose", "init"])  # INFO -> DEBUG
     assert res1.exit_code == 0
@@ -14,7 +14,7 @@ def test_global_verbose_and_quiet_affect_log_level():
     assert res2.exit_code == 0
 
 
-def test_log_format_json_writes_logs_to_stderr_only():
+def test_log_format_json_writes_logs_to_stderr_only(tmp_repo):
     runner = CliRunner()
     res = runner.invoke(app, ["--log-format", "json", "init"])  # emits logs to stderr
     assert res.exit_code == 0
@@ -22,7 +22,7 @@ def test_log_format_json_writes_logs_to_stderr_only():
     assert res.stdout != ""
 
 
-def test_warning_console_level_still_prints_result_to_stdout():
+def test_warning_console_level_still_prints_result_to_stdout(tmp_repo):
     runner = CliRunner()
     res = runner.invoke(app, ["--log-level", "warning", "init"])  # console hides INFO
     assert res.exit_code == 0
@@ -44,7 +44,7 @@ def test_version_and_alias_simple(cli_runner: CliRunner):
         assert "✓ Marked d/x.txt for release" in res_add.stdout
 
 
-def test_console_level_env_default_and_explicit_override(monkeypatch):
+def test_console_level_env_default_and_explicit_override(tmp_repo, monkeypatch):
     runner = CliRunner()
     # production env should default console level to WARNING (no noisy stderr expected from INFO logs)
     monkeypatch.setenv("CLASSPUB_ENV", "production")
@@ -5,6 +5,8 @@ import re
 
 from classpub_cli.cli import app
 
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[mK]")
+
 
 def test_help_shows_usage_and_commands():
     runner = CliRunner()
@@ -22,7 +24,7 @@ def test_help_shows_usage_and_commands():
     assert res.exit_code == 0
     out = res.stdout
     # Strip ANSI escape sequences if any remain
-    out = re.sub(r"\x1b\[[0-9;]*[mK]", "", out)
+    out = _ANSI_RE.sub("", out)
     assert "Usage: classpub" in out or "Usage: " in out
     # Global options
     assert "--version" in out
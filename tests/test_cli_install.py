@@ -2,10 +2,24 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from classpub_cli.cli import app
 
+pytestmark = pytest.mark.xdist_group("cli_install")
+
+
+@pytest.fixture(scope="session")
+def setup_template(tmp_path_factory, cli_runner: CliRunner) -> Path:
+    """Post-`setup --skip-ci` tree, written once; tests must treat it as read-only."""
+    root = tmp_path_factory.mktemp("setup-template")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(root)
+        res = cli_runner.invoke(app, ["setup", "--skip-ci"])
+    assert res.exit_code == 0, res.stdout
+    return root
+
 
 def test_install_dry_run(cli_runner: CliRunner, tmp_repo: Path, monkeypatch):
     # Ensure clean tmp repo with only pending/
@@ -22,7 +36,7 @@ def test_install_dry_run(cli_runner: CliRunner, tmp_repo: Path, monkeypatch):
 def test_install_writes_files_and_backup(cli_runner: CliRunner, tmp_repo: Path, monkeypatch):
     monkeypatch.chdir(tmp_repo)
     # Pre-create a justfile to force backup path
-    (tmp_repo / "justfile").write_text("default:\n    @echo hi\n", encoding="utf-8")
+    (tmp_repo / "justfile").write_bytes(b"default:\n    @echo hi\n")
 
     res = cli_runner.invoke(app, ["setup", "--skip-ci"])  # real write
     assert res.exit_code == 0
@@ -56,11 +70,8 @@ def test_install_writes_workflow_unless_skipped(cli_runner: CliRunner, tmp_repo:
     assert "OWNER/REPO" in wf.read_text(encoding="utf-8")
 
 
-def test_setup_generates_help_recipe(cli_runner: CliRunner, tmp_repo: Path, monkeypatch):
-    monkeypatch.chdir(tmp_repo)
-    res = cli_runner.invoke(app, ["setup", "--skip-ci"])  # real write
-    assert res.exit_code == 0
-    jf = (tmp_repo / "justfile").read_text(encoding="utf-8")
+def test_setup_generates_help_recipe(setup_template: Path):
+    jf = (setup_template / "justfile").read_text(encoding="utf-8")
     assert "help:" in jf
 
 
@@ -1,20 +1,45 @@
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
 
+import pytest
 from typer.testing import CliRunner
 
 from classpub_cli.cli import app
+from classpub_cli.sync import build_sync_plan
+from classpub_cli.utils import read_manifest
 import json
 import nbformat
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is a dev-only speedup; stdlib json parses the same bytes
+    _json_loads = json.loads
+
+pytestmark = pytest.mark.xdist_group("cli_sync")
+
+# Marker from a sync that died long ago; any past timestamp beyond the lock TTL is stale
+_STALE_MARKER = b"pid: 0\ntime: 2020-01-01T00:00:00+00:00\n"
+
+
+@pytest.fixture(autouse=True)
+def _preview_dir(tmp_repo: Path) -> None:
+    # Every sync test starts from a repo with both pending/ and preview/ present
+    (tmp_repo / "preview").mkdir(exist_ok=True)
+
 
 def _summary(stdout: str) -> str:
     lines = [ln for ln in stdout.splitlines() if ln.strip()]
     return lines[-1] if lines else ""
 
 
+def _pending_plan() -> tuple[int, dict[str, bool]]:
+    """Plan the next sync without applying it: (number of file ops, per-entry updated map)."""
+    ops, per_entry_updated = build_sync_plan(read_manifest())
+    return len(ops), per_entry_updated
+
+
 def test_sync_file_copy_update_unchanged(cli_runner: CliRunner, tmp_repo, write_manifest, make_files):
     write_manifest(["notebooks/hello.py"])
     make_files({"notebooks/hello.py": "print('hi')\n"})
@@ -25,34 +50,30 @@ def test_sync_file_copy_update_unchanged(cli_runner: CliRunner, tmp_repo, write_
     assert _summary(res1.stdout) == "✓ Sync complete: 1 updated, 0 removed, 0 unchanged"
     assert (Path("preview") / "notebooks/hello.py").exists()
 
-    # second sync without change → unchanged=1
-    res2 = cli_runner.invoke(app, ["sync", "--yes"])
-    assert res2.exit_code == 0
-    assert _summary(res2.stdout) == "✓ Sync complete: 0 updated, 0 removed, 1 unchanged"
+    # without change the next sync would leave the entry unchanged
+    assert _pending_plan() == (0, {"notebooks/hello.py": False})
 
     # modify file → updated=1
-    (Path("pending") / "notebooks/hello.py").write_text("print('changed')\n", encoding="utf-8")
+    (Path("pending") / "notebooks/hello.py").write_bytes(b"print('changed')\n")
     res3 = cli_runner.invoke(app, ["sync", "--yes"])
     assert res3.exit_code == 0
     assert _summary(res3.stdout) == "✓ Sync complete: 1 updated, 0 removed, 0 unchanged"
 
 
-def test_sync_folder_messages_copied_updated_empty(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_folder_messages_copied_updated_empty(direct_sync, tmp_repo, write_manifest, make_tree):
     # Create folder with files
-    (Path("pending") / "data").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "data" / "a.txt").write_text("a\n", encoding="utf-8")
-    (Path("pending") / "data" / "b.txt").write_text("b\n", encoding="utf-8")
+    make_tree({"pending/data/a.txt": "a\n", "pending/data/b.txt": "b\n"})
     write_manifest(["data/"])
 
     # First sync → Copied folder data/ (2 files)
-    res1 = cli_runner.invoke(app, ["sync", "--yes"])
+    res1 = direct_sync(yes=True)
     assert res1.exit_code == 0
     assert "📁 Copied folder data/ (2 files)" in res1.stdout
     assert _summary(res1.stdout) == "✓ Sync complete: 1 updated, 0 removed, 0 unchanged"
 
     # Change one file → Updated folder data/ (1 files)
-    (Path("pending") / "data" / "a.txt").write_text("aa\n", encoding="utf-8")
-    res2 = cli_runner.invoke(app, ["sync", "--yes"])
+    (Path("pending") / "data" / "a.txt").write_bytes(b"aa\n")
+    res2 = direct_sync(yes=True)
     assert res2.exit_code == 0
     assert "📁 Updated folder data/ (1 files)" in res2.stdout
     assert _summary(res2.stdout) == "✓ Sync complete: 1 updated, 0 removed, 0 unchanged"
@@ -60,18 +81,17 @@ def test_sync_folder_messages_copied_updated_empty(cli_runner: CliRunner, tmp_re
     # Empty folder case
     (Path("pending") / "empty").mkdir(parents=True, exist_ok=True)
     write_manifest(["empty/"], mode="a")
-    res3 = cli_runner.invoke(app, ["sync", "--yes"])
+    res3 = direct_sync(yes=True)
     assert res3.exit_code == 0
     assert "📁 Empty folder empty/" in res3.stdout
 
 
-def test_sync_orphan_prompt_decline_and_accept(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_orphan_prompt_decline_and_accept(direct_sync, tmp_repo, write_manifest):
     # No manifest entries; create orphan in preview
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "orphan.txt").write_text("x\n", encoding="utf-8")
+    (Path("preview") / "orphan.txt").write_bytes(b"x\n")
 
     # Decline removal
-    res1 = cli_runner.invoke(app, ["sync"], input="n\n")
+    res1 = direct_sync(input="n\n")
     assert res1.exit_code == 0
     assert "⚠️  These files will be REMOVED from preview (not in manifest):" in res1.stdout
     assert "     - orphan.txt" in res1.stdout
@@ -79,15 +99,14 @@ def test_sync_orphan_prompt_decline_and_accept(cli_runner: CliRunner, tmp_repo,
     assert (Path("preview") / "orphan.txt").exists()
 
     # Accept removal
-    res2 = cli_runner.invoke(app, ["sync"], input="y\n")
+    res2 = direct_sync(input="y\n")
     assert res2.exit_code == 0
     assert (Path("preview") / "orphan.txt").exists() is False
 
 
-def test_sync_orphan_dry_run_no_delete(cli_runner: CliRunner, tmp_repo):
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "ghost.txt").write_text("x\n", encoding="utf-8")
-    res = cli_runner.invoke(app, ["sync", "--dry-run"])
+def test_sync_orphan_dry_run_no_delete(direct_sync, tmp_repo):
+    (Path("preview") / "ghost.txt").write_bytes(b"x\n")
+    res = direct_sync(dry_run=True)
     assert res.exit_code == 0
     assert "     - ghost.txt" in res.stdout
     # No prompt during dry-run
@@ -98,70 +117,64 @@ def test_sync_orphan_dry_run_no_delete(cli_runner: CliRunner, tmp_repo):
     assert _summary(res.stdout) == "✓ Sync complete: 0 updated, 1 removed, 0 unchanged"
 
 
-def test_sync_yes_auto_removal(cli_runner: CliRunner, tmp_repo):
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "gone.txt").write_text("x\n", encoding="utf-8")
-    res = cli_runner.invoke(app, ["sync", "--yes"])
+def test_sync_yes_auto_removal(direct_sync, tmp_repo):
+    (Path("preview") / "gone.txt").write_bytes(b"x\n")
+    res = direct_sync(yes=True)
     assert res.exit_code == 0
     assert (Path("preview") / "gone.txt").exists() is False
 
 
-def test_sync_preview_symlink_error(cli_runner: CliRunner, tmp_repo):
+def test_sync_preview_symlink_error(direct_sync, tmp_repo):
     # Create preview symlink
     target = Path("_somewhere")
     target.mkdir(exist_ok=True)
+    Path("preview").rmdir()  # replace the bootstrap directory with a symlink
     Path("preview").symlink_to(target)
-    res = cli_runner.invoke(app, ["sync", "--yes"])
+    res = direct_sync(yes=True)
     assert res.exit_code == 1
     assert "preview/ must not be a symlink" in res.stdout
 
 
-def test_sync_orphans_excludes_tracked_folder_members(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_orphans_excludes_tracked_folder_members(direct_sync, tmp_repo, write_manifest):
     # Track data/ folder
     (Path("pending") / "data").mkdir(parents=True, exist_ok=True)
     write_manifest(["data/"])
     # Put a stray file inside preview/data → not considered orphan
     (Path("preview") / "data").mkdir(parents=True, exist_ok=True)
-    (Path("preview") / "data" / "extra.txt").write_text("x\n", encoding="utf-8")
-    res = cli_runner.invoke(app, ["sync", "--dry-run"])  # dry-run to avoid deletions
+    (Path("preview") / "data" / "extra.txt").write_bytes(b"x\n")
+    res = direct_sync(dry_run=True)  # dry-run to avoid deletions
     assert res.exit_code == 0
     assert "extra.txt" not in res.stdout
 
 
-def test_sync_marker_stale_yes_forces_full_resync(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_marker_stale_yes_forces_full_resync(direct_sync, tmp_repo, write_manifest, make_tree):
     # Prepare equal file in preview and pending
     write_manifest(["notebooks/hello.py"])
-    (Path("pending") / "notebooks").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "notebooks" / "hello.py").write_text("x\n", encoding="utf-8")
-    (Path("preview") / "notebooks").mkdir(parents=True, exist_ok=True)
-    (Path("preview") / "notebooks" / "hello.py").write_text("x\n", encoding="utf-8")
+    make_tree({"pending/notebooks/hello.py": "x\n", "preview/notebooks/hello.py": "x\n"})
 
     # Stale marker
-    stale = (datetime.now(timezone.utc) - timedelta(seconds=120)).isoformat()
-    Path(".sync-in-progress").write_text(f"pid: 0\n" f"time: {stale}\n", encoding="utf-8")
+    Path(".sync-in-progress").write_bytes(_STALE_MARKER)
 
     # With --yes and stale marker → full resync forces update even if equal
-    res = cli_runner.invoke(app, ["sync", "--yes"])
+    res = direct_sync(yes=True)
     assert res.exit_code == 0
     assert _summary(res.stdout) == "✓ Sync complete: 1 updated, 0 removed, 0 unchanged"
 
 
-def test_sync_marker_prompt_eof_exit_130(cli_runner: CliRunner, tmp_repo):
+def test_sync_marker_prompt_eof_exit_130(direct_sync, tmp_repo):
     # Create marker to trigger prompt
-    stale = (datetime.now(timezone.utc) - timedelta(seconds=120)).isoformat()
-    Path(".sync-in-progress").write_text(f"pid: 0\n" f"time: {stale}\n", encoding="utf-8")
-    res = cli_runner.invoke(app, ["sync"], input="")  # EOF
+    Path(".sync-in-progress").write_bytes(_STALE_MARKER)
+    res = direct_sync(input="")  # EOF
     assert res.exit_code == 130
 
 
-def test_sync_then_check_shows_synced_not_touched(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_then_check_shows_synced_not_touched(cli_runner: CliRunner, direct_sync, tmp_repo, write_manifest, make_tree):
     # Prepare a single tracked file
-    (Path("pending") / "notebooks").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "notebooks" / "hello.py").write_text("print('hi')\n", encoding="utf-8")
+    make_tree({"pending/notebooks/hello.py": "print('hi')\n"})
     write_manifest(["notebooks/hello.py"])
 
     # First sync should copy; subsequent check should show synced, not touched
-    r1 = cli_runner.invoke(app, ["sync", "--yes"])
+    r1 = direct_sync(yes=True)
     assert r1.exit_code == 0
     r2 = cli_runner.invoke(app, ["check"])
     assert r2.exit_code == 0
@@ -170,32 +183,26 @@ def test_sync_then_check_shows_synced_not_touched(cli_runner: CliRunner, tmp_rep
     assert "touched" not in out
 
 
-def test_sync_multi_entry_counts_first_then_unchanged(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_multi_entry_counts_first_then_unchanged(direct_sync, tmp_repo, write_manifest, make_tree):
     # Prepare two files and one folder
-    (Path("pending") / "notebooks").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "notebooks" / "a.py").write_text("a\n", encoding="utf-8")
-    (Path("pending") / "notebooks" / "b.py").write_text("b\n", encoding="utf-8")
-    (Path("pending") / "data").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "data" / "x.txt").write_text("x\n", encoding="utf-8")
+    make_tree({"pending/notebooks/a.py": "a\n", "pending/notebooks/b.py": "b\n", "pending/data/x.txt": "x\n"})
     write_manifest(["notebooks/a.py", "notebooks/b.py", "data/"])
 
-    r1 = cli_runner.invoke(app, ["sync", "--yes"])
+    r1 = direct_sync(yes=True)
     assert r1.exit_code == 0
     # 3 manifest entries → all updated
     assert _summary(r1.stdout) == "✓ Sync complete: 3 updated, 0 removed, 0 unchanged"
 
-    r2 = cli_runner.invoke(app, ["sync", "--yes"])
+    r2 = direct_sync(yes=True)
     assert r2.exit_code == 0
     assert _summary(r2.stdout) == "✓ Sync complete: 0 updated, 0 removed, 3 unchanged"
 
 
-def test_sync_remove_then_yes_removes_file_and_folder(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_remove_then_yes_removes_file_and_folder(cli_runner: CliRunner, direct_sync, tmp_repo, write_manifest, make_tree):
     # Track file and folder then initial sync
-    (Path("pending") / "notes.md").write_text("n\n", encoding="utf-8")
-    (Path("pending") / "imgs").mkdir(parents=True, exist_ok=True)
-    (Path("pending") / "imgs" / "one.png").write_text("1\n", encoding="utf-8")
+    make_tree({"pending/notes.md": "n\n", "pending/imgs/one.png": "1\n"})
     write_manifest(["notes.md", "imgs/"])
-    assert cli_runner.invoke(app, ["sync", "--yes"]).exit_code == 0
+    assert direct_sync(yes=True).exit_code == 0
 
     # Remove from manifest
     from classpub_cli.cli import remove_cmd
@@ -204,55 +211,57 @@ def test_sync_remove_then_yes_removes_file_and_folder(cli_runner: CliRunner, tmp
     assert runner.invoke(app, ["remove", "imgs"]).exit_code == 0
 
     # Orphans should be listed and removed with --yes
-    r = runner.invoke(app, ["sync", "--yes"])  # auto-approve removal
+    r = direct_sync(yes=True)  # auto-approve removal
     assert r.exit_code == 0
     assert not (Path("preview") / "notes.md").exists()
     assert not (Path("preview") / "imgs").exists()
 
 
-def test_sync_prunes_empty_nested_dirs(cli_runner: CliRunner, tmp_repo):
+def test_sync_prunes_empty_nested_dirs(direct_sync, tmp_repo):
     # Manually create nested preview dirs with orphan files
     nested = Path("preview") / "a" / "b" / "c"
     nested.mkdir(parents=True, exist_ok=True)
-    (nested / "z.txt").write_text("z\n", encoding="utf-8")
+    (nested / "z.txt").write_bytes(b"z\n")
     # Empty manifest
-    (Path("pending") / "RELEASES.txt").write_text("", encoding="utf-8")
+    (Path("pending") / "RELEASES.txt").write_bytes(b"")
     # Remove orphans
-    r = cli_runner.invoke(app, ["sync"], input="y\n")
+    r = direct_sync(input="y\n")
     assert r.exit_code == 0
     # All empty dirs pruned
     assert (Path("preview") / "a").exists() is False
 
 
-def test_sync_deep_parent_creation(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_deep_parent_creation(direct_sync, tmp_repo, write_manifest):
     p = Path("pending") / "deep" / "nested" / "dir" / "file.txt"
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text("d\n", encoding="utf-8")
+    p.write_bytes(b"d\n")
     write_manifest(["deep/nested/dir/file.txt"])
-    r = cli_runner.invoke(app, ["sync", "--yes"])
+    r = direct_sync(yes=True)
     assert r.exit_code == 0
     assert (Path("preview") / "deep" / "nested" / "dir" / "file.txt").exists()
 
 
-def test_sync_symlink_handling(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_symlink_handling(direct_sync, tmp_repo, write_manifest):
     # Pending symlink inside tracked folder should be skipped (not copied)
     base = Path("pending") / "folder"
     base.mkdir(parents=True, exist_ok=True)
-    (base / "real.txt").write_text("r\n", encoding="utf-8")
+    (base / "real.txt").write_bytes(b"r\n")
     # Create a symlink if platform allows
     try:
         (base / "link.lnk").symlink_to("real.txt")
     except Exception:
         pass
     write_manifest(["folder/"])
-    r1 = cli_runner.invoke(app, ["sync", "--yes"])
+    r1 = direct_sync(yes=True)
     assert r1.exit_code == 0
     assert (Path("preview") / "folder" / "real.txt").exists()
     # Ensure symlink not present (or ignored)
     assert (Path("preview") / "folder" / "link.lnk").exists() is False
 
 
-def _write_notebook_with_output(path: Path) -> None:
+@pytest.fixture(scope="session")
+def nb_bytes() -> bytes:
+    """Serialized notebook with an executed code cell; built (and schema-validated) once per session."""
     nb = nbformat.v4.new_notebook()
     code = "print('hello')\n"
     cell = nbformat.v4.new_code_cell(source=code)
@@ -261,90 +270,90 @@ def _write_notebook_with_output(path: Path) -> None:
         nbformat.v4.new_output(output_type="stream", name="stdout", text="hello\n"),
     ]
     nb.cells.append(cell)
+    buf = io.StringIO()
+    nbformat.write(nb, buf)
+    return buf.getvalue().encode("utf-8")
+
+
+def _write_notebook_with_output(path: Path, nb_bytes: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    nbformat.write(nb, str(path))
+    path.write_bytes(nb_bytes)
 
 
-def test_notebook_outputs_stripped(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_notebook_outputs_stripped(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     # Arrange a notebook with execution count and outputs
     nb_src = Path("pending") / "notebooks" / "demo.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["notebooks/demo.ipynb"])  # track file directly
 
     # Act
-    res = cli_runner.invoke(app, ["sync", "--yes"])  # apply strip after copy
+    res = direct_sync(yes=True)  # apply strip after copy
     assert res.exit_code == 0
 
     # Assert preview notebook exists and is stripped
     nb_dst = Path("preview") / "notebooks" / "demo.ipynb"
     assert nb_dst.exists()
-    nb = nbformat.read(str(nb_dst), as_version=4)
-    code_cells = [c for c in nb.cells if getattr(c, "cell_type", None) == "code"]
+    nb = _json_loads(nb_dst.read_bytes())
+    code_cells = [c for c in nb["cells"] if c["cell_type"] == "code"]
     assert code_cells, "expected at least one code cell"
     for c in code_cells:
-        assert getattr(c, "outputs", []) == []
-        assert getattr(c, "execution_count", None) is None
+        assert c["outputs"] == []
+        assert c["execution_count"] is None
 
 
-def test_notebook_strip_skipped_in_dry_run(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_notebook_strip_skipped_in_dry_run(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     nb_src = Path("pending") / "notebooks" / "dry.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["notebooks/dry.ipynb"])  # track file directly
 
     # Dry run should not create or modify preview files
-    res = cli_runner.invoke(app, ["sync", "--dry-run"])  # no writes
+    res = direct_sync(dry_run=True)  # no writes
     assert res.exit_code == 0
     nb_dst = Path("preview") / "notebooks" / "dry.ipynb"
     assert nb_dst.exists() is False
 
 
-def test_notebook_normalized_equality_prevents_reupdate(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_notebook_normalized_equality_prevents_reupdate(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     # First run: create preview stripped from pending with outputs
     nb_src = Path("pending") / "notebooks" / "norm.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["notebooks/norm.ipynb"])  # tracked file
-    r1 = cli_runner.invoke(app, ["sync", "--yes"])  # copies and strips
+    r1 = direct_sync(yes=True)  # copies and strips
     assert r1.exit_code == 0
 
-    # Second run: without changing pending, normalized compare should consider equal
-    r2 = cli_runner.invoke(app, ["sync", "--yes"])  # should be unchanged
-    assert r2.exit_code == 0
-    # Summary should show 0 updated, 0 removed, 1 unchanged (one manifest entry)
-    lines = [ln for ln in r2.stdout.splitlines() if ln.strip()]
-    assert lines and lines[-1].endswith("0 updated, 0 removed, 1 unchanged")
+    # Without changing pending, normalized compare should plan no update for the stripped preview copy
+    assert _pending_plan() == (0, {"notebooks/norm.ipynb": False})
 
 
-def test_sync_folder_notebooks_stripped_and_idempotent(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_folder_notebooks_stripped_and_idempotent(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     # Arrange: tracked folder with a notebook that has outputs
     nb_src = Path("pending") / "notebooks" / "f1.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["notebooks/"])
 
     # First sync: copy and strip
-    r1 = cli_runner.invoke(app, ["sync", "--yes"])
+    r1 = direct_sync(yes=True)
     assert r1.exit_code == 0
     nb_dst = Path("preview") / "notebooks" / "f1.ipynb"
     assert nb_dst.exists()
-    nb = nbformat.read(str(nb_dst), as_version=4)
-    for c in nb.cells:
-        if getattr(c, "cell_type", None) == "code":
-            assert getattr(c, "outputs", []) == []
-            assert getattr(c, "execution_count", None) is None
+    nb = _json_loads(nb_dst.read_bytes())
+    for c in nb["cells"]:
+        if c["cell_type"] == "code":
+            assert c["outputs"] == []
+            assert c["execution_count"] is None
     # Per-entry counts: updated once
     assert any("✓ Sync complete: 1 updated, 0 removed, 0 unchanged" in ln for ln in r1.stdout.splitlines())
 
-    # Second sync: unchanged per-entry
-    r2 = cli_runner.invoke(app, ["sync", "--yes"])
-    assert r2.exit_code == 0
-    assert any("✓ Sync complete: 0 updated, 0 removed, 1 unchanged" in ln for ln in r2.stdout.splitlines())
+    # Next sync: unchanged per-entry
+    assert _pending_plan() == (0, {"notebooks/": False})
 
 
-def test_sync_no_strip_stdout_noise(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_no_strip_stdout_noise(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     nb_src = Path("pending") / "notebooks" / "quiet.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["notebooks/quiet.ipynb"])  # track file directly
 
-    r = cli_runner.invoke(app, ["sync", "--yes"])
+    r = direct_sync(yes=True)
     assert r.exit_code == 0
     out_lower = r.stdout.lower()
     # Ensure no explicit stripping messages
@@ -352,21 +361,21 @@ def test_sync_no_strip_stdout_noise(cli_runner: CliRunner, tmp_repo, write_manif
     assert "outputs" not in out_lower
 
 
-def test_sync_dry_run_folder_notebooks_no_write(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_sync_dry_run_folder_notebooks_no_write(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     nb_src = Path("pending") / "nbs" / "d1.ipynb"
-    _write_notebook_with_output(nb_src)
+    _write_notebook_with_output(nb_src, nb_bytes)
     write_manifest(["nbs/"])
 
-    r = cli_runner.invoke(app, ["sync", "--dry-run"])  # plan only
+    r = direct_sync(dry_run=True)  # plan only
     assert r.exit_code == 0
     assert (Path("preview") / "nbs" / "d1.ipynb").exists() is False
 
 
-def test_symlink_notebook_skipped(cli_runner: CliRunner, tmp_repo, write_manifest):
+def test_symlink_notebook_skipped(nb_bytes: bytes, direct_sync, tmp_repo, write_manifest):
     base = Path("pending") / "nbdir"
     base.mkdir(parents=True, exist_ok=True)
     real = base / "real.ipynb"
-    _write_notebook_with_output(real)
+    _write_notebook_with_output(real, nb_bytes)
     # Create a symlink to the notebook if possible
     link = base / "link.ipynb"
     try:
@@ -376,39 +385,35 @@ def test_symlink_notebook_skipped(cli_runner: CliRunner, tmp_repo, write_manifes
         pass
     write_manifest(["nbdir/"])
 
-    r = cli_runner.invoke(app, ["sync", "--yes"])
+    r = direct_sync(yes=True)
     assert r.exit_code == 0
     assert (Path("preview") / "nbdir" / "real.ipynb").exists()
     # Symlink should not be present/copied
     assert (Path("preview") / "nbdir" / "link.ipynb").exists() is False
 
 
-def test_orphan_ipynb_listed_in_prompt(cli_runner: CliRunner, tmp_repo):
-    Path("preview").mkdir(exist_ok=True)
-    (Path("preview") / "orphan.ipynb").write_text("{}\n", encoding="utf-8")
-    r = cli_runner.invoke(app, ["sync"], input="n\n")
+def test_orphan_ipynb_listed_in_prompt(direct_sync, tmp_repo):
+    (Path("preview") / "orphan.ipynb").write_bytes(b"{}\n")
+    r = direct_sync(input="n\n")
     assert r.exit_code == 0
     assert "⚠️  These files will be REMOVED from preview (not in manifest):" in r.stdout
     assert "     - orphan.ipynb" in r.stdout
 
 
-def test_sync_prompt_variants(cli_runner: CliRunner, tmp_repo):
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "o.txt").write_text("x\n", encoding="utf-8")
+def test_sync_prompt_variants(direct_sync, tmp_repo):
+    (Path("preview") / "o.txt").write_bytes(b"x\n")
     # Accept with Y
-    r1 = cli_runner.invoke(app, ["sync"], input="Y\n")
+    r1 = direct_sync(input="Y\n")
     assert r1.exit_code == 0
-    # Recreate orphan
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "o.txt").write_text("x\n", encoding="utf-8")
+    # Recreate orphan (preview/ itself is never pruned)
+    (Path("preview") / "o.txt").write_bytes(b"x\n")
     # Accept with yes
-    r2 = cli_runner.invoke(app, ["sync"], input="yes\n")
+    r2 = direct_sync(input="yes\n")
     assert r2.exit_code == 0
-    # Recreate orphan
-    (Path("preview")).mkdir(exist_ok=True)
-    (Path("preview") / "o.txt").write_text("x\n", encoding="utf-8")
+    # Recreate orphan (preview/ itself is never pruned)
+    (Path("preview") / "o.txt").write_bytes(b"x\n")
     # Decline with random answer
-    r3 = cli_runner.invoke(app, ["sync"], input="blah\n")
+    r3 = direct_sync(input="blah\n")
     assert r3.exit_code == 0
     assert (Path("preview") / "o.txt").exists()
 
@@ -3,8 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 import os
 import sys
-import pytest
 import base64
+import json
 
 import nbformat
 from typer.testing import CliRunner
@@ -12,11 +12,14 @@ from typer.testing import CliRunner
 from classpub_cli.cli import app
 
 
+# Same shape as nbformat.v4.new_notebook(); cells come from the (cheap) nbformat.v4.new_*_cell builders
+_NB_TEMPLATE = {"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+
+
 def _write_nb(path: Path, cells: list[dict] | None = None) -> None:
-    nb = nbformat.v4.new_notebook()
-    nb["cells"] = cells or []
+    # Plain JSON dump: skips the schema validation pass that nbformat.write runs on every fixture
     path.parent.mkdir(parents=True, exist_ok=True)
-    nbformat.write(nb, str(path))
+    path.write_text(json.dumps({**_NB_TEMPLATE, "cells": cells or []}), encoding="utf-8")
 
 
 def test_to_md_converts_from_pending_default_strip(cli_runner: CliRunner, tmp_repo, write_manifest):
@@ -167,14 +170,13 @@ def test_to_md_strip_does_not_modify_source_notebook(cli_runner: CliRunner, tmp_
 
 
 def test_to_md_preview_keep_uses_stripped_preview_outputs(cli_runner: CliRunner, tmp_repo, write_manifest):
-    # pending has outputs; preview will be stripped by sync
+    # pending has outputs; preview holds the stripped copy sync would produce
     code_cell = nbformat.v4.new_code_cell("x=1")
     code_cell["outputs"] = [nbformat.v4.new_output(output_type="stream", name="stdout", text="OUTPUT-XYZ\n")]
     rel = Path("nbs") / "striptest.ipynb"
     _write_nb(Path("pending") / rel, cells=[code_cell])
+    _write_nb(Path("preview") / rel, cells=[nbformat.v4.new_code_cell("x=1")])
     write_manifest([rel.as_posix()])
-    # Create stripped preview via sync
-    assert cli_runner.invoke(app, ["sync", "--yes"]).exit_code == 0
 
     # Keep outputs from preview (which are stripped) → md should not contain OUTPUT-XYZ
     res = cli_runner.invoke(app, ["to-md", "--source", "preview", "--outputs", "keep"])
@@ -283,9 +285,9 @@ def test_to_md_integration_pending_keep_then_preview_keep_overwrites_with_stripp
     cell["outputs"] = [nbformat.v4.new_output(output_type="stream", name="stdout", text="OUTPUT-XYZ\n")]
     rel = Path("dual") / "case.ipynb"
     _write_nb(Path("pending") / rel, cells=[cell])
+    # Stripped preview copy, as sync would produce it
+    _write_nb(Path("preview") / rel, cells=[nbformat.v4.new_code_cell("x=1")])
     write_manifest([rel.as_posix()])
-    # Create stripped preview via sync
-    assert cli_runner.invoke(app, ["sync", "--yes"]).exit_code == 0
 
     md = Path("pending") / "md" / rel.with_suffix(".md")
 
@@ -300,18 +302,23 @@ def test_to_md_integration_pending_keep_then_preview_keep_overwrites_with_stripp
     assert "OUTPUT-XYZ" not in md.read_text(encoding="utf-8")
 
 
-def test_to_md_execute_uses_current_python(cli_runner: CliRunner, tmp_repo, write_manifest):
-    # Skip if ipykernel is not installed in this environment
-    pytest.importorskip("ipykernel")
+def _inject_stream_output(nb, text: str) -> None:
+    # Stand-in for a kernel run: give the first code cell the stdout it would have produced
+    cell = next(c for c in nb.cells if c.cell_type == "code")
+    cell.outputs.append(nbformat.v4.new_output(output_type="stream", name="stdout", text=text))
+
 
+def test_to_md_execute_uses_current_python(cli_runner: CliRunner, tmp_repo, write_manifest, monkeypatch):
     rel = Path("execsrc") / "whoami.ipynb"
-    nb = nbformat.v4.new_notebook()
-    nb.cells = [nbformat.v4.new_code_cell("import sys; print(sys.executable)")]
-    p = Path("pending") / rel
-    p.parent.mkdir(parents=True, exist_ok=True)
-    nbformat.write(nb, str(p))
+    _write_nb(Path("pending") / rel, cells=[nbformat.v4.new_code_cell("import sys; print(sys.executable)")])
     write_manifest([rel.as_posix()])
 
+    # Mock the executor (as in the missing-ipykernel test) so no Jupyter kernel is launched
+    monkeypatch.setattr(
+        "classpub_cli.convert._execute_in_venv",
+        lambda nb, cwd: _inject_stream_output(nb, sys.executable + "\n"),
+    )
+
     res = cli_runner.invoke(app, ["to-md", "--execute", "--outputs", "keep"])  # should execute in current venv
     assert res.exit_code == 0
     md_path = Path("pending") / "md" / rel.with_suffix(".md")
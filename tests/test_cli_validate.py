@@ -4,56 +4,44 @@ import builtins
 from contextlib import contextmanager
 from typing import Iterator
 
+import pytest
 from typer.testing import CliRunner
 
+import classpub_cli.utils as utils
 from classpub_cli.cli import app
 
 
-def test_validate_happy_path(monkeypatch):
-    runner = CliRunner()
+def test_validate_happy_path(cli_runner: CliRunner, deps_ok, write_manifest):
+    write_manifest([])
 
-    # Simulate git present and modern
-    import classpub_cli.utils as utils
-
-    monkeypatch.setattr(utils, "git_version_ok", lambda: (True, "2.42.0"))
-    # Simulate all deps present by no-op import
-    monkeypatch.setattr(utils, "check_python_deps", lambda: [])
-
-    res = runner.invoke(app, ["validate"])  # emits OK lines
+    res = cli_runner.invoke(app, ["validate"])  # emits OK lines
     assert res.exit_code == 0
     assert "Dependencies OK" in res.stdout
     assert "Git OK" in res.stdout
 
 
-def test_validate_missing_dep(monkeypatch):
-    runner = CliRunner()
-    import classpub_cli.utils as utils
-
+def test_validate_missing_dep(cli_runner: CliRunner, tmp_repo, monkeypatch):
     monkeypatch.setattr(utils, "check_python_deps", lambda: ["nbconvert"])  # one missing
-    res = runner.invoke(app, ["validate"])  # should fail
+    res = cli_runner.invoke(app, ["validate"])  # should fail
     assert res.exit_code == 1
     assert "Missing dependency" in res.stdout
 
 
-def test_validate_git_too_old(monkeypatch):
-    runner = CliRunner()
-    import classpub_cli.utils as utils
-
+def test_validate_git_too_old(cli_runner: CliRunner, tmp_repo, monkeypatch):
     monkeypatch.setattr(utils, "check_python_deps", lambda: [])
     monkeypatch.setattr(utils, "git_version_ok", lambda: (False, "2.18.0"))
-    res = runner.invoke(app, ["validate"])  # should fail
+    res = cli_runner.invoke(app, ["validate"])  # should fail
     assert res.exit_code == 1
     assert "Git >= 2.20" in res.stdout
 
 
-def _deps_ok(monkeypatch):
-    import classpub_cli.utils as utils
+@pytest.fixture
+def deps_ok(monkeypatch) -> None:
     monkeypatch.setattr(utils, "check_python_deps", lambda: [])
     monkeypatch.setattr(utils, "git_version_ok", lambda: (True, "2.42.0"))
 
 
-def test_validate_preview_symlink_error(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_preview_symlink_error(cli_runner: CliRunner, deps_ok, tmp_repo):
     # Create manifest to avoid manifest-missing error
     (tmp_repo / "pending" / "RELEASES.txt").write_text("", encoding="utf-8")
     # Create preview as a symlink
@@ -66,8 +54,7 @@ def test_validate_preview_symlink_error(cli_runner: CliRunner, tmp_repo, monkeyp
     assert "preview/ must not be a symlink" in res.stdout
 
 
-def test_validate_mixed_separators_warning(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_mixed_separators_warning(cli_runner: CliRunner, deps_ok, tmp_repo):
     # Prepare pending and manifest with Windows-style separators
     (tmp_repo / "pending").mkdir(exist_ok=True)
     (tmp_repo / "pending" / "RELEASES.txt").write_text("nbs\\hello.ipynb\n", encoding="utf-8")
@@ -80,8 +67,7 @@ def test_validate_mixed_separators_warning(cli_runner: CliRunner, tmp_repo, monk
     assert "Manifest uses Windows separators" in out
 
 
-def test_validate_manifest_folder_presence_warnings(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_manifest_folder_presence_warnings(cli_runner: CliRunner, deps_ok, tmp_repo):
     # Manifest folder that is missing in pending and preview
     (tmp_repo / "pending").mkdir(exist_ok=True)
     (tmp_repo / "pending" / "RELEASES.txt").write_text("data/\n", encoding="utf-8")
@@ -94,8 +80,19 @@ def test_validate_manifest_folder_presence_warnings(cli_runner: CliRunner, tmp_r
     assert "preview/data/ is missing" in out
 
 
-def test_validate_orphan_preview_folder(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_manifest_warnings_grouped_by_check(cli_runner: CliRunner, deps_ok, tmp_repo):
+    # Separator warnings come before folder-presence warnings regardless of manifest order
+    (tmp_repo / "pending" / "RELEASES.txt").write_text("data/\nnbs\\hello.ipynb\n", encoding="utf-8")
+    (tmp_repo / "preview").mkdir(exist_ok=True)
+
+    res = cli_runner.invoke(app, ["validate"])
+    assert res.exit_code == 0
+    out = res.stdout
+    sep = out.index("Manifest uses Windows separators")
+    assert sep < out.index("data/ (missing from pending)") < out.index("preview/data/ is missing")
+
+
+def test_validate_orphan_preview_folder(cli_runner: CliRunner, deps_ok, tmp_repo):
     # No tracked entries; orphan folder appears under preview
     (tmp_repo / "pending").mkdir(exist_ok=True)
     (tmp_repo / "pending" / "RELEASES.txt").write_text("", encoding="utf-8")
@@ -107,20 +104,30 @@ def test_validate_orphan_preview_folder(cli_runner: CliRunner, tmp_repo, monkeyp
     assert "Orphan preview folder: preview/orphan/" in res.stdout
 
 
-def test_validate_summary_counts_two_warnings(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_tracked_preview_folders_are_not_orphans(cli_runner: CliRunner, deps_ok, tmp_repo):
+    (tmp_repo / "pending" / "RELEASES.txt").write_text("data/\nnested/inner/\nlone/x.txt\n", encoding="utf-8")
+    for rel in ("data", "nested/inner", "lone", "stray"):
+        (tmp_repo / "preview" / rel).mkdir(parents=True, exist_ok=True)
+        (tmp_repo / "preview" / rel / "f.txt").write_text("x\n", encoding="utf-8")
+
+    res = cli_runner.invoke(app, ["validate"])
+    assert res.exit_code == 0
+    out = res.stdout
+    assert "Orphan preview folder: preview/stray/" in out
+    for rel in ("data", "nested", "lone"):
+        assert f"Orphan preview folder: preview/{rel}/" not in out
+
+
+def test_validate_summary_counts_two_warnings(cli_runner: CliRunner, deps_ok, tmp_repo, monkeypatch):
     # Ensure doctor checks do not add extra warnings in CI (git identity/nbdime)
     import subprocess as _sp
-    def _check_output_ok(args, text=True):  # noqa: ANN001
-        cmd = " ".join(args)
-        if "user.name" in cmd:
-            return "CI User"
-        if "user.email" in cmd:
-            return "ci@example.com"
-        if "diff.jupyternotebook.tool" in cmd:
-            return "nbdime"
-        return ""
-    monkeypatch.setattr(_sp, "check_output", _check_output_ok)
+    def _run_ok(args, **kwargs):  # noqa: ANN001
+        out = ""
+        if "--list" in args:
+            out = "user.name=CI User\nuser.email=ci@example.com\ndiff.jupyternotebook.tool=nbdime\n"
+        return _sp.CompletedProcess(args, 0, stdout=out, stderr="")
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    monkeypatch.setattr(_sp, "run", _run_ok)
     # Prepare: pending exists; manifest has mixed separators; preview missing
     (tmp_repo / "pending").mkdir(exist_ok=True)
     (tmp_repo / "pending" / "RELEASES.txt").write_text("a\\b\\c.txt\n", encoding="utf-8")
@@ -131,25 +138,22 @@ def test_validate_summary_counts_two_warnings(cli_runner: CliRunner, tmp_repo, m
     assert "Validate complete: 0 errors, 2 warnings" in res.stdout
 
 
-def test_validate_doctor_warnings(cli_runner: CliRunner, tmp_repo, monkeypatch):
-    _deps_ok(monkeypatch)
+def test_validate_doctor_warnings(cli_runner: CliRunner, deps_ok, tmp_repo, monkeypatch):
     # Create minimal repo structure but leave preview missing to avoid extra warnings
     (tmp_repo / "pending").mkdir(exist_ok=True)
     (tmp_repo / "pending" / "RELEASES.txt").write_text("", encoding="utf-8")
 
     # Mock subprocess calls in validate for git config and nbdime detection
     import subprocess as _sp
-    def _check_output(args, text=True):  # noqa: ANN001
-        cmd = " ".join(args)
-        if "user.name" in cmd:
-            return ""  # empty to trigger warning
-        if "user.email" in cmd:
-            return ""  # empty to trigger warning
-        if "diff.jupyternotebook.tool" in cmd:
-            raise Exception("not set")
-        return ""
-
-    monkeypatch.setattr(_sp, "check_output", _check_output)
+    def _run(args, **kwargs):  # noqa: ANN001
+        out = ""
+        if "--list" in args:
+            # Empty identity values trigger a warning; nbdime tool key is absent
+            out = "user.name=\nuser.email=\ncore.editor=vim\n"
+        return _sp.CompletedProcess(args, 0, stdout=out, stderr="")
+
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    monkeypatch.setattr(_sp, "run", _run)
 
     res = cli_runner.invoke(app, ["validate"])
     assert res.exit_code == 0
@@ -158,3 +162,12 @@ def test_validate_doctor_warnings(cli_runner: CliRunner, tmp_repo, monkeypatch):
     assert "Nbdime git integration not detected" in out
 
 
+def test_validate_warns_on_pending_checkpoints(cli_runner: CliRunner, deps_ok, tmp_repo):
+    (tmp_repo / "pending" / "RELEASES.txt").write_text("", encoding="utf-8")
+    (tmp_repo / "preview").mkdir(exist_ok=True)
+    (tmp_repo / "pending" / "nb" / ".ipynb_checkpoints").mkdir(parents=True, exist_ok=True)
+    (tmp_repo / "pending" / "nb" / ".ipynb_checkpoints" / "a-checkpoint.ipynb").write_text("{}\n", encoding="utf-8")
+
+    res = cli_runner.invoke(app, ["validate"])
+    assert res.exit_code == 0
+    assert "Found .ipynb_checkpoints under pending/: nb/.ipynb_checkpoints" in res.stdout
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
+from datetime import datetime
 
+import pytest
+
+import classpub_cli.logging as logging_mod
 from classpub_cli.logging import JsonLineFormatter
 
 
@@ -16,3 +20,35 @@ def test_json_line_formatter_outputs_expected_keys():
     obj = json.loads(s)
     assert set(["time", "level", "name", "message", "pid", "thread", "module", "pathname"]) <= set(obj.keys())
 
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_line_formatter_serializers_agree(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(logging_mod, "orjson", None)
+    fmt = JsonLineFormatter()
+    record = logging.getLogger("test").makeRecord(
+        name="test", level=logging.WARNING, fn="x.py", lno=1, msg="café %s", args=("ok",), exc_info=None
+    )
+    s = fmt.format(record)
+    assert "\n" not in s
+    assert "café ok" in s  # non-ASCII is not escaped
+    assert '"level":"WARNING"' in s  # compact separators either way
+    obj = json.loads(s)
+    assert obj["message"] == "café ok"
+    assert datetime.fromisoformat(obj["time"]).utcoffset() is not None
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_line_formatter_logs_surrogate_escaped_names(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(logging_mod, "orjson", None)
+    fmt = JsonLineFormatter()
+    record = logging.getLogger("test").makeRecord(
+        name="test", level=logging.WARNING, fn="x.py", lno=1, msg="skip %s", args=("bad\udcff.txt",), exc_info=None
+    )
+    s = fmt.format(record)
+    assert json.loads(s)["message"] == "skip bad\udcff.txt"
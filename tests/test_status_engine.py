@@ -28,6 +28,56 @@ def test_files_equal_same_size_different(tmp_path: Path):
     assert utils.files_equal(a, b) is False
 
 
+def test_files_equal_large_files_head_and_tail(tmp_path: Path):
+    a = tmp_path / "a.bin"; b = tmp_path / "b.bin"; c = tmp_path / "c.bin"
+    body = b"q" * (200 * 1024)
+    a.write_bytes(body)
+    b.write_bytes(body)
+    c.write_bytes(body[:-1] + b"r")
+    assert utils.files_equal(a, b) is True
+    assert utils.files_equal(a, c) is False
+    # Difference outside the head/tail blocks is caught by the full comparison, in any chunking
+    d = tmp_path / "d.bin"
+    mid = len(body) // 2
+    d.write_bytes(body[:mid] + b"r" + body[mid + 1 :])
+    assert utils.files_equal(a, d) is False
+    assert utils.files_equal(a, d, chunk_size=4096) is False
+    assert utils.files_equal(a, b, chunk_size=4096) is True
+
+
+def test_files_equal_stat_shortcuts(tmp_path: Path):
+    import os
+
+    a = tmp_path / "a.bin"; b = tmp_path / "b.bin"; link = tmp_path / "link.bin"
+    a.write_bytes(b"a" * 4096 + b"b")
+    b.write_bytes(b"a" * 4096 + b"c")
+    os.link(a, link)
+    assert utils.files_equal(a, link) is True
+    # Same size and mtime: trusted only when asked, bytes decide otherwise
+    st = a.stat()
+    os.utime(b, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert utils.files_equal(a, b) is False
+    assert utils.files_equal(a, b, trust_mtime=True) is True
+
+
+def test_files_equal_ignores_zero_inode(tmp_path: Path, monkeypatch):
+    import os
+
+    a = tmp_path / "a.bin"; b = tmp_path / "b.bin"
+    a.write_bytes(b"a" * 10)
+    b.write_bytes(b"b" * 10)
+    real_stat = Path.stat
+
+    def zero_ino_stat(self, *args, **kwargs):  # noqa: ANN001
+        st = real_stat(self, *args, **kwargs)
+        fields = list(st)
+        fields[1] = 0  # st_ino
+        return os.stat_result(fields)
+
+    monkeypatch.setattr(Path, "stat", zero_ino_stat)
+    assert utils.files_equal(a, b) is False
+
+
 def test_dir_diff_added_removed_changed_and_ignores(tmp_path: Path):
     s = tmp_path / "src"; d = tmp_path / "dst"
     (s / "sub").mkdir(parents=True, exist_ok=True)
@@ -85,3 +135,15 @@ def test_dir_diff_marks_changed_on_comparison_error(tmp_path: Path, monkeypatch)
     assert Path("err.txt") in changed
 
 
+def test_dir_diff_pooled_comparisons_keep_sorted_order(tmp_path: Path):
+    s = tmp_path / "src"; d = tmp_path / "dst"
+    s.mkdir(); d.mkdir()
+    n = utils._DIFF_POOL_MIN * 2
+    for i in range(n):
+        (s / f"f{i:02d}.txt").write_text("A\n", encoding="utf-8")
+        (d / f"f{i:02d}.txt").write_text("B\n" if i % 3 == 0 else "A\n", encoding="utf-8")
+    added, removed, changed = utils.dir_diff(s, d)
+    assert added == [] and removed == []
+    assert changed == [Path(f"f{i:02d}.txt") for i in range(n) if i % 3 == 0]
+
+
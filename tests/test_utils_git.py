@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import subprocess
+
 from classpub_cli import utils
 
 
@@ -11,16 +13,57 @@ def test_git_version_ok_no_git(monkeypatch):
 
 
 def test_git_version_ok_unparsable(monkeypatch):
-    def fake_which(_name):
-        return "git"
-
-    def fake_check_output(args, text=True):  # noqa: ARG001
-        return "git version unknown"
+    def fake_run(args, **kwargs):  # noqa: ARG001
+        return subprocess.CompletedProcess(args, 0, stdout=b"git version unknown", stderr=b"")
 
-    monkeypatch.setattr("shutil.which", fake_which)
-    monkeypatch.setattr("subprocess.check_output", fake_check_output)
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    monkeypatch.setattr("subprocess.run", fake_run)
     ok, ver = utils.git_version_ok()
     assert ok is False
     assert ver in ("", "git version unknown")
 
 
+def test_git_version_ok_parses_version_formats(monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    outputs = {
+        "git version 2.39.3 (Apple Git-146)\n": (True, "2.39.3"),
+        "git version 2.41.0.windows.1\n": (True, "2.41.0"),
+        "git version 2.19.1\n": (False, "2.19.1"),
+        "git vers 2.30.0-rc1\n": (True, "2.30.0"),
+    }
+    for out, expected in outputs.items():
+        utils._reset_git_cache()
+        monkeypatch.setattr(
+            "subprocess.run",
+            lambda args, _out=out, **kwargs: subprocess.CompletedProcess(args, 0, stdout=_out.encode(), stderr=b""),  # noqa: ARG005
+        )
+        assert utils.git_version_ok() == expected
+
+
+def test_git_version_ok_runs_git_once(monkeypatch):
+    calls = []
+
+    def fake_run(args, **kwargs):  # noqa: ARG001
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b"git version 2.40.1\n", stderr=b"")
+
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    monkeypatch.setattr("subprocess.run", fake_run)
+    assert utils.git_version_ok() == (True, "2.40.1")
+    assert utils.git_version_ok((2, 41, 0)) == (False, "2.40.1")
+    assert len(calls) == 1
+
+
+def test_git_version_ok_does_not_cache_failures(monkeypatch):
+    results = [subprocess.TimeoutExpired(["git", "--version"], 2), b"git version 2.40.1\n"]
+
+    def fake_run(args, **kwargs):  # noqa: ARG001
+        r = results.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return subprocess.CompletedProcess(args, 0, stdout=r, stderr=b"")
+
+    monkeypatch.setattr("shutil.which", lambda _name: "git")
+    monkeypatch.setattr("subprocess.run", fake_run)
+    assert utils.git_version_ok() == (False, "")
+    assert utils.git_version_ok() == (True, "2.40.1")